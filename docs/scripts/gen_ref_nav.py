@@ -1,5 +1,8 @@
 """Generate the code reference pages and navigation."""
 
+import os
+from collections.abc import Iterator
+from operator import itemgetter
 from pathlib import Path
 
 import mkdocs_gen_files
@@ -10,16 +13,34 @@ nav = mkdocs_gen_files.Nav()
 root = Path(__file__).parent.parent.parent
 src = root / "src"
 
+# Directories that never contain documented modules
+SKIP_DIRS = frozenset({"__pycache__", ".venv", ".mypy_cache", "build", "dist"})
+
 # Store navigation items
 nav_items = []
 
+
+def _iter_py(directory: str) -> Iterator[str]:
+    """Yield paths of Python files under ``directory`` using cached dirent types."""
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name in SKIP_DIRS or entry.name.startswith("."):
+                    continue
+                yield from _iter_py(entry.path)
+            elif entry.name.endswith(".py") and entry.is_file(follow_symlinks=False):
+                yield entry.path
+
+
 # Generate documentation pages for each Python module
-for path in sorted(src.rglob("*.py")):
-    module_path = path.relative_to(src).with_suffix("")
-    doc_path = path.relative_to(src).with_suffix(".md")
+src_from_root = src.relative_to(root)
+
+for path_str in sorted(_iter_py(str(src))):
+    rel_path = Path(path_str).relative_to(src)
+    doc_path = rel_path.with_suffix(".md").as_posix()
     full_doc_path = Path("reference", doc_path)
 
-    parts = tuple(module_path.parts)
+    parts = rel_path.with_suffix("").parts
 
     if parts[-1] == "__init__":
         parts = parts[:-1]
@@ -30,33 +51,37 @@ for path in sorted(src.rglob("*.py")):
     if not parts:
         continue
 
-    nav[parts] = doc_path.as_posix()
-    nav_items.append((parts, doc_path.as_posix()))
+    nav[parts] = doc_path
+    nav_items.append((parts, doc_path))
 
+    # Pages are not skipped based on mtimes: mkdocs-gen-files hands every build
+    # a fresh temporary directory, so a page that is not written is missing.
     with mkdocs_gen_files.open(full_doc_path, "w") as fd:
         ident = ".".join(parts)
         fd.write(f"::: {ident}")
 
-    mkdocs_gen_files.set_edit_path(full_doc_path, path.relative_to(root))
+    mkdocs_gen_files.set_edit_path(full_doc_path, src_from_root / rel_path)
 
 # Create the navigation summary manually
 with mkdocs_gen_files.open("reference/SUMMARY.md", "w") as nav_file:
     # First try the official method
     try:
         nav_content = list(nav.build_literate_nav())
-        if nav_content:
-            nav_file.writelines(nav_content)
-        else:
-            msg = "Empty navigation content"
-            raise ValueError(msg)
-    except:  # noqa: E722
-        # Fallback to manual navigation
-        if nav_items:
-            for parts, doc_path in sorted(nav_items):
-                level = len(parts)
-                indent = "  " * (level - 1)
-                title = parts[-1].replace("_", " ").title()
-                nav_file.write(f"{indent}* [{title}]({doc_path})\n")
+    except Exception:
+        nav_content = []
+
+    if nav_content:
+        nav_file.writelines(nav_content)
+    elif nav_items:
+        # Fallback to manual navigation. Items were appended in path order,
+        # which only differs from module order around "__init__" stripping,
+        # so an in-place keyed sort is close to linear here.
+        nav_items.sort(key=itemgetter(0))
+        lines = [
+            f"{'  ' * (len(parts) - 1)}* [{parts[-1].replace('_', ' ').title()}]({doc_path})\n"
+            for parts, doc_path in nav_items
+        ]
+        nav_file.write("".join(lines))
 
 # Copy top-level changelog.md into the docs output (visible to MkDocs)
 changelog_src = root / "CHANGELOG.md"
@@ -13,6 +13,9 @@ import sys
 import time
 import logging
 
+import requests
+from requests.adapters import HTTPAdapter
+
 # IMPORTANT: MLflow will only use the secrets auth plugin if this env var is set.
 # You can set it in your shell, .env, or here in code for demo purposes:
 os.environ.setdefault("MLFLOW_TRACKING_AUTH", "mlflow_secrets_auth")
@@ -24,6 +27,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Shared HTTP session so direct calls from the demo reuse pooled connections
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
 
 def check_plugin_installation():
     """Verify that the mlflow-secrets-auth plugin is properly installed."""
@@ -31,10 +39,10 @@ def check_plugin_installation():
 
     try:
         import mlflow_secrets_auth
-        logger.info(f"✅ Plugin installed: version {mlflow_secrets_auth.__version__}")
+        logger.info("✅ Plugin installed: version %s", mlflow_secrets_auth.__version__)
         return True
     except ImportError as e:
-        logger.error(f"❌ Plugin not installed: {e}")
+        logger.error("❌ Plugin not installed: %s", e)
         return False
 
 
@@ -50,21 +58,22 @@ def check_environment():
         'MLFLOW_SECRETS_AUTH_ENABLE',
     ]
 
+    env = os.environ
     missing_vars = []
     for var in required_vars:
-        value = os.getenv(var)
+        value = env.get(var)
         if not value:
             missing_vars.append(var)
-        else:
-            # Mask sensitive values in logs
-            if 'TOKEN' in var or 'PASSWORD' in var:
-                display_value = f"{value[:4]}...{value[-4:]}" if len(value) > 8 else "***"
-            else:
-                display_value = value
-            logger.info(f"  {var}: {display_value}")
+            continue
+
+        # Mask sensitive values in logs
+        sensitive = 'TOKEN' in var or 'PASSWORD' in var
+        masked = f"{value[:4]}...{value[-4:]}" if len(value) > 8 else "***"
+        display_value = masked if sensitive else value
+        logger.info("  %s: %s", var, display_value)
 
     if missing_vars:
-        logger.error(f"❌ Missing environment variables: {missing_vars}")
+        logger.error("❌ Missing environment variables: %s", missing_vars)
         return False
 
     logger.info("✅ Environment configuration looks good!")
@@ -100,36 +109,45 @@ def test_vault_connectivity():
             logger.info("✅ Successfully connected to Vault and read secret")
             return True
         except Exception as e:
-            logger.warning(f"⚠️  Could not read secret (but connection works): {e}")
+            logger.warning("⚠️  Could not read secret (but connection works): %s", e)
             return True  # Connection works even if secret read fails
 
     except ImportError:
         logger.error("❌ hvac package not available")
         return False
     except Exception as e:
-        logger.error(f"❌ Vault connectivity test failed: {e}")
+        logger.error("❌ Vault connectivity test failed: %s", e)
         return False
 
 
-def wait_for_mlflow():
-    """Wait for MLflow server to be ready."""
-    logger.info("⏳ Waiting for MLflow server to be ready...")
+def wait_for_mlflow(timeout=60.0):
+    """Wait for MLflow server to be ready.
 
-    import requests
+    Polls the health endpoint with HEAD requests over the shared session,
+    backing off exponentially from 100ms up to 5s between attempts.
+    """
+    logger.info("⏳ Waiting for MLflow server to be ready...")
 
     tracking_uri = os.getenv('MLFLOW_TRACKING_URI')
     health_url = f"{tracking_uri}/health"
 
-    for attempt in range(30):  # Wait up to 60 seconds
+    deadline = time.monotonic() + timeout
+    delay = 0.1
+    attempt = 0
+    while True:
+        attempt += 1
         try:
-            response = requests.get(health_url, timeout=5)
+            response = _SESSION.head(health_url, timeout=2)
             if response.status_code == 200:
                 logger.info("✅ MLflow server is ready!")
                 return True
-        except Exception as e:
-            logger.debug(f"MLflow not ready yet (attempt {attempt + 1}/30): {e}")
+        except requests.RequestException as e:
+            logger.debug("MLflow not ready yet (attempt %d): %s", attempt, e)
 
-        time.sleep(2)
+        if time.monotonic() + delay > deadline:
+            break
+        time.sleep(delay)
+        delay = min(delay * 2, 5.0)
 
     logger.error("❌ MLflow server did not become ready in time")
     return False
@@ -151,6 +169,11 @@ def run_demo_experiments():
         data.data, data.target, test_size=0.2, random_state=42,
     )
 
+    # Train once; both scenarios only differ in how the result is logged
+    model = RandomForestClassifier(n_estimators=10, max_depth=2, random_state=42)
+    model.fit(x_train, y_train)
+    accuracy = accuracy_score(y_test, model.predict(x_test))
+
     experiment_name = "vault-auth-demo"
 
     # --- Scenario 1: MLflow without plugin (should fail with 401) ---
@@ -160,15 +183,11 @@ def run_demo_experiments():
     try:
         mlflow.set_experiment(experiment_name)
         with mlflow.start_run(run_name="rf_model_fail"):
-            model = RandomForestClassifier(n_estimators=10, max_depth=2, random_state=42)
-            model.fit(x_train, y_train)
-            y_pred = model.predict(x_test)
-            accuracy = accuracy_score(y_test, y_pred)
             mlflow.log_metric("accuracy", accuracy)
         logger.error("❌ ERROR: MLflow run succeeded without authentication! This should not happen.")
         return False
     except Exception as e:
-        logger.info(f"✅ Expected failure: {e}")
+        logger.info("✅ Expected failure: %s", e)
     finally:
         if prev_auth:
             os.environ["MLFLOW_TRACKING_AUTH"] = prev_auth
@@ -178,15 +197,11 @@ def run_demo_experiments():
     try:
         mlflow.set_experiment(experiment_name)
         with mlflow.start_run(run_name="rf_model_success"):
-            model = RandomForestClassifier(n_estimators=10, max_depth=2, random_state=42)
-            model.fit(x_train, y_train)
-            y_pred = model.predict(x_test)
-            accuracy = accuracy_score(y_test, y_pred)
             mlflow.log_metric("accuracy", accuracy)
         logger.info("✅ MLflow run succeeded with plugin authentication!")
         return True
     except Exception as e:
-        logger.error(f"❌ MLflow run failed with plugin: {e}")
+        logger.error("❌ MLflow run failed with plugin: %s", e)
         return False
 
 
@@ -197,15 +212,8 @@ def verify_results():
     try:
         import mlflow
 
-        # List experiments
-        experiments = mlflow.search_experiments()
-        demo_exp = None
-        for exp in experiments:
-            if exp.name == "vault-auth-demo":
-                demo_exp = exp
-                break
-
-        if not demo_exp:
+        demo_exp = mlflow.get_experiment_by_name("vault-auth-demo")
+        if demo_exp is None:
             logger.error("❌ Demo experiment not found")
             return False
 
@@ -216,18 +224,18 @@ def verify_results():
             logger.error("❌ No runs found in demo experiment")
             return False
 
-        logger.info(f"✅ Found {len(runs)} runs in demo experiment")
+        logger.info("✅ Found %d runs in demo experiment", len(runs))
 
         # Display summary
         logger.info("📊 Experiment Summary:")
         for idx, run in runs.iterrows():
-            logger.info(f"  Run {idx + 1}: accuracy={run.get('metrics.accuracy', 'N/A'):.3f}, "
-                       f"n_estimators={run.get('params.n_estimators', 'N/A')}")
+            logger.info("  Run %d: accuracy=%.3f, n_estimators=%s",
+                        idx + 1, run.get('metrics.accuracy', 'N/A'), run.get('params.n_estimators', 'N/A'))
 
         return True
 
     except Exception as e:
-        logger.error(f"❌ Results verification failed: {e}")
+        logger.error("❌ Results verification failed: %s", e)
         return False
 
 
@@ -243,14 +251,14 @@ def display_access_info():
     if auth_mode == 'basic':
         username = os.getenv('MLFLOW_USERNAME', 'mlflow-user')
         password = os.getenv('MLFLOW_PASSWORD', 'secure-password-123')
-        logger.info(f"  Username: {username}")
-        logger.info(f"  Password: {password}")
+        logger.info("  Username: %s", username)
+        logger.info("  Password: %s", password)
     else:
         api_key = os.getenv('MLFLOW_API_KEY', 'mlflow-api-key-demo-567890abcdef')
-        logger.info(f"  API Key: {api_key}")
+        logger.info("  API Key: %s", api_key)
 
     vault_token = os.getenv('VAULT_ROOT_TOKEN', 'demo-root-token-12345')
-    logger.info(f"  Vault Token: {vault_token}")
+    logger.info("  Vault Token: %s", vault_token)
 
 
 def main():
@@ -267,9 +275,9 @@ def main():
     ]
 
     for check_name, check_func in checks:
-        logger.info(f"Running check: {check_name}")
+        logger.info("Running check: %s", check_name)
         if not check_func():
-            logger.error(f"❌ Check failed: {check_name}")
+            logger.error("❌ Check failed: %s", check_name)
             sys.exit(1)
         logger.info("")
 
@@ -7,14 +7,14 @@ Public API:
 
 This module also exposes a best-effort ``__version__`` so the CLI `info` command
 can display a version even in editable installs where distribution metadata
-may be unavailable.
+may be unavailable. It is resolved lazily on first access.
 """
 
 from __future__ import annotations
 
 import importlib.metadata
 from typing import ClassVar
-from .base import SecretsBackedAuthProvider
+from .base import AuthMode, SecretsBackedAuthProvider
 from .config import is_provider_enabled
 from .providers.aws_secrets_manager import AWSSecretsManagerAuthProvider
 from .providers.azure_key_vault import AzureKeyVaultAuthProvider
@@ -29,11 +29,48 @@ from mlflow_secrets_auth.constants import (
     PROVIDER_AZURE,
 )
 
-# Best-effort version export (useful for CLI/info without installed dist metadata)
-try:  # pragma: no cover - environment dependent
-    __version__ = importlib.metadata.version(PACKAGE_NAME)
-except importlib.metadata.PackageNotFoundError:  # pragma: no cover
-    __version__ = "0.0.0+local"
+
+def _resolve_version() -> str:
+    """Return the installed distribution version, or a local placeholder.
+
+    Returns:
+        The package version from distribution metadata, or ``"0.0.0+local"``
+        when the distribution is not installed.
+
+    """
+    try:
+        return importlib.metadata.version(PACKAGE_NAME)
+    except importlib.metadata.PackageNotFoundError:
+        return "0.0.0+local"
+
+
+# Best-effort version export (useful for CLI/info without installed dist metadata),
+# bound by ``__getattr__`` below on first access
+__version__: str
+
+
+def __getattr__(name: str) -> str:
+    """Resolve ``__version__`` on first access and cache it on the module.
+
+    Keeps the distribution-metadata lookup off the import path; MLflow imports
+    this package in every client session but rarely needs the version.
+
+    Args:
+        name: Attribute being looked up.
+
+    Returns:
+        The package version string.
+
+    Raises:
+        AttributeError: For any attribute other than ``__version__``.
+
+    """
+    if name == "__version__":
+        version = _resolve_version()
+        globals()["__version__"] = version
+        return version
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
 
 
 class SecretsAuthProviderFactory(SecretsBackedAuthProvider):
@@ -97,6 +134,21 @@ class SecretsAuthProviderFactory(SecretsBackedAuthProvider):
 
     # Delegation to concrete provider
 
+    def _resolved_config(self) -> tuple[str, AuthMode, int]:
+        """Resolve the delegated config, memoized against the actual provider's variables.
+
+        The factory declares no `_config_env_vars` of its own; the delegated hooks
+        read the actual provider's, so those are the snapshot keys.
+
+        Returns:
+            A `(cache_key, auth_mode, ttl)` tuple.
+
+        """
+        provider = self._get_actual_provider()
+        if provider is not None:
+            self._config_env_vars = provider._config_env_vars  # noqa: SLF001
+        return super()._resolved_config()
+
     def _fetch_secret(self) -> str | None:
         """Delegate secret fetching to the actual provider, if available.
 
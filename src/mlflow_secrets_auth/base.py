@@ -20,17 +20,27 @@ from __future__ import annotations
 
 import base64
 import logging
+import os
+import threading
 from abc import ABC, abstractmethod
 from typing import Literal, TypedDict
 from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 from mlflow.tracking.request_auth.abstract_request_auth_provider import (
     RequestAuthProvider,
 )
 
 from .cache import cached_fetch, delete_cache_key
-from .config import get_allowed_hosts, get_auth_header_name, is_provider_enabled
+from .config import (
+    get_allowed_hosts,
+    get_auth_header_name,
+    is_auto_refresh_enabled,
+    is_provider_enabled,
+    provider_enable_env_key,
+)
 from .utils import (
     is_host_allowed,
     parse_secret_json,
@@ -42,10 +52,16 @@ from .utils import (
 from .constants import (
     AUTH_MODE_BEARER,
     AUTH_MODE_BASIC,
+    AUTH_ERROR_STATUS_CODES,
     DEFAULT_AUTH_HEADER,
     DEFAULT_TTL_SECONDS,
+    ENV_ALLOWED_HOSTS,
+    ENV_AUTH_ENABLE,
     HEADER_RETRY_MARKER,
     HEADER_RETRY_VALUE,
+    REFRESH_WAIT_TIMEOUT_SECONDS,
+    RETRY_POOL_CONNECTIONS,
+    RETRY_POOL_MAXSIZE,
     SECRET_FIELD_PASSWORD,
     SECRET_FIELD_TOKEN,
     SECRET_FIELD_USERNAME,
@@ -70,6 +86,45 @@ from .messages import (
 
 AuthMode = Literal["bearer", "basic"]
 
+_retry_session: requests.Session | None = None
+_retry_session_lock = threading.Lock()
+
+
+def _get_retry_session() -> requests.Session:
+    """Return the process-wide pooled session used for auth-refresh retries.
+
+    Created lazily so importing the plugin does not allocate connection pools.
+
+    Returns:
+        A shared `requests.Session` with sized HTTP and HTTPS adapters.
+
+    """
+    global _retry_session
+    if _retry_session is None:
+        with _retry_session_lock:
+            if _retry_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=RETRY_POOL_CONNECTIONS, pool_maxsize=RETRY_POOL_MAXSIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _retry_session = session
+    return _retry_session
+
+
+class _RefreshFlight:
+    """An in-progress credential refresh that concurrent auth failures can join."""
+
+    __slots__ = ("done", "secret")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.secret: SecretData | None = None
+
+
+# In-flight refreshes keyed by provider cache key
+_refresh_flights: dict[str, _RefreshFlight] = {}
+_refresh_flights_lock = threading.Lock()
+
 
 class SecretData(TypedDict, total=False):
     """Structured representation of parsed secret material."""
@@ -79,6 +134,51 @@ class SecretData(TypedDict, total=False):
     password: str
 
 
+def _clone_for_retry(request: requests.PreparedRequest) -> requests.PreparedRequest:
+    """Clone a prepared request for a one-off authentication retry.
+
+    Unlike `PreparedRequest.copy`, only the headers are copied, since the retry
+    rewrites them. The body, URL and cookie jar are shared with the original request,
+    which is finished once its response has arrived. Hooks are not carried over;
+    the original request's hooks still run on the response returned for it.
+
+    Args:
+        request: The request that received an authentication failure.
+
+    Returns:
+        A new prepared request ready for fresh credentials.
+
+    """
+    retry = requests.PreparedRequest()
+    retry.method = request.method
+    retry.url = request.url
+    retry.headers = CaseInsensitiveDict(request.headers)
+    retry.body = request.body
+    retry._cookies = request._cookies  # noqa: SLF001
+    retry._body_position = request._body_position  # noqa: SLF001
+    return retry
+
+
+def _secret_mode_error(secret: SecretData, auth_mode: str) -> str | None:
+    """Return why a secret cannot be used with an auth mode, or None if it can.
+
+    Args:
+        secret: Parsed secret data.
+        auth_mode: Configured authentication mode.
+
+    Returns:
+        An error message for an incompatible secret, otherwise None.
+
+    """
+    if SECRET_FIELD_TOKEN in secret:
+        if auth_mode == AUTH_MODE_BASIC and ":" not in secret[SECRET_FIELD_TOKEN]:
+            return ERROR_BASIC_TOKEN_FORMAT
+        return None
+    if SECRET_FIELD_USERNAME in secret and SECRET_FIELD_PASSWORD in secret:
+        return ERROR_BEARER_WITH_USERPASS if auth_mode == AUTH_MODE_BEARER else None
+    return ERROR_SECRET_MISSING_TOKEN_OR_CREDS
+
+
 def _normalize_header_name(header_name: str | None) -> str:
     """Normalize the configured auth header name.
 
@@ -108,7 +208,7 @@ class BearerAuth(requests.auth.AuthBase):
 
     """
 
-    __slots__ = ("header_name", "token")
+    __slots__ = ("_header_value", "header_name", "token")
 
     def __init__(self, token: str, header_name: str = DEFAULT_AUTH_HEADER) -> None:
         """Initialize bearer authentication.
@@ -120,10 +220,11 @@ class BearerAuth(requests.auth.AuthBase):
         """
         self.token = token
         self.header_name = header_name
+        self._header_value = f"Bearer {token}"
 
     def __call__(self, r: requests.PreparedRequest) -> requests.PreparedRequest:
         """Attach the bearer token header to the outgoing request."""
-        r.headers[self.header_name] = f"Bearer {self.token}"
+        r.headers[self.header_name] = self._header_value
         return r
 
 
@@ -139,7 +240,7 @@ class BasicAuth(requests.auth.AuthBase):
 
     """
 
-    __slots__ = ("header_name", "password", "username")
+    __slots__ = ("_header_value", "header_name", "password", "username")
 
     def __init__(self, username: str, password: str, header_name: str = DEFAULT_AUTH_HEADER) -> None:
         """Initialize basic authentication.
@@ -153,11 +254,13 @@ class BasicAuth(requests.auth.AuthBase):
         self.username = username
         self.password = password
         self.header_name = header_name
+        # Encode once; the header is applied to every outgoing request
+        creds = f"{username}:{password}".encode()
+        self._header_value = f"Basic {base64.b64encode(creds).decode()}"
 
     def __call__(self, r: requests.PreparedRequest) -> requests.PreparedRequest:
         """Attach the basic auth header to the outgoing request."""
-        creds = f"{self.username}:{self.password}".encode()
-        r.headers[self.header_name] = f"Basic {base64.b64encode(creds).decode()}"
+        r.headers[self.header_name] = self._header_value
         return r
 
 
@@ -194,7 +297,7 @@ class _AutoRefreshAuth(requests.auth.AuthBase):
 
     Wraps another AuthBase and automatically handles 401/403 responses by:
     1. Busting the provider's cache key
-    2. Refetching fresh credentials
+    2. Refetching fresh credentials (concurrent failures share a single refresh)
     3. Retrying the request once
 
     Attributes:
@@ -231,19 +334,48 @@ class _AutoRefreshAuth(requests.auth.AuthBase):
         r.hooks["response"].append(self._handle_auth_failure)
         return r
 
+    def _refresh_secret(self) -> SecretData | None:
+        """Bust the cache and refetch credentials, coalescing concurrent callers.
+
+        The first caller for a cache key performs the refresh. Callers that arrive
+        while it is in flight wait for it and reuse its result instead of hitting
+        the secrets backend again.
+
+        Returns:
+            Fresh secret data, or None if the refresh failed or timed out.
+
+        """
+        with _refresh_flights_lock:
+            flight = _refresh_flights.get(self.cache_key)
+            leader = flight is None
+            if leader:
+                flight = _refresh_flights[self.cache_key] = _RefreshFlight()
+
+        if not leader:
+            flight.done.wait(REFRESH_WAIT_TIMEOUT_SECONDS)
+            return flight.secret
+
+        try:
+            delete_cache_key(self.cache_key)
+            flight.secret = self.provider._fetch_secret_cached()  # noqa: SLF001
+            return flight.secret
+        finally:
+            with _refresh_flights_lock:
+                _refresh_flights.pop(self.cache_key, None)
+            flight.done.set()
+
     def _handle_auth_failure(self, response: requests.Response, *_args, **_kwargs) -> requests.Response:
         """Handle authentication failures by refreshing credentials and retrying once."""
         # Only handle 401/403 responses and avoid retry loops
         if (
-            response.status_code not in (401, 403) or
+            response.status_code not in AUTH_ERROR_STATUS_CODES or
             response.request.headers.get(HEADER_RETRY_MARKER) == HEADER_RETRY_VALUE
         ):
             return response
 
         try:
-            # Bust the cache and refetch credentials
-            delete_cache_key(self.cache_key)
-            secret_data = self.provider._fetch_secret_cached()  # noqa: SLF001
+            # Bust the cache and refetch credentials (once per concurrent burst)
+            secret_data = self._refresh_secret()
             if not secret_data:
                 safe_log(
                     self.provider.logger,
@@ -256,7 +388,7 @@ class _AutoRefreshAuth(requests.auth.AuthBase):
             fresh_auth = self.provider._create_auth(secret_data)  # noqa: SLF001
 
             # Clone the original request
-            retry_request = response.request.copy()
+            retry_request = _clone_for_retry(response.request)
             retry_request.headers[HEADER_RETRY_MARKER] = HEADER_RETRY_VALUE
 
             # Apply fresh authentication
@@ -269,8 +401,8 @@ class _AutoRefreshAuth(requests.auth.AuthBase):
                 INFO_RETRYING_REQUEST.format(status_code=response.status_code),
             )
 
-            # Use the same session to maintain connection pooling
-            session = getattr(response, "connection", None) or requests.Session()
+            # Reuse a pooled connection rather than opening a new one per retry
+            session = getattr(response, "connection", None) or _get_retry_session()
             retry_response = session.send(retry_request)
 
             safe_log(
@@ -313,6 +445,20 @@ class SecretsBackedAuthProvider(RequestAuthProvider, ABC):
 
     """
 
+    # Raw enable-flag values the cached enablement verdict was computed from
+    _enabled_snapshot: tuple[str | None, str | None] | None = None
+    _enabled: bool = False
+
+    # Raw allowlist value the parsed allowlist below was built from
+    _allowed_hosts_raw: str | None = None
+    _allowed_hosts: tuple[str, ...] | None = None
+
+    # Environment variables read by `_get_cache_key`, `_get_auth_mode` and `_get_ttl`.
+    # When declared, their results are memoized until one of these values changes.
+    _config_env_vars: tuple[str, ...] = ()
+    _config_snapshot: tuple[str | None, ...] | None = None
+    _config: tuple[str, AuthMode, int] | None = None
+
     def __init__(self, provider_name: str, default_ttl: int = DEFAULT_TTL_SECONDS) -> None:
         """Initialize the provider base.
 
@@ -324,6 +470,7 @@ class SecretsBackedAuthProvider(RequestAuthProvider, ABC):
         self.provider_name = provider_name
         self.default_ttl = default_ttl
         self.logger = setup_logger(f"mlflow_secrets_auth.{provider_name}")
+        self._enable_env_key = provider_enable_env_key(provider_name)
 
     # MLflow-required interface
 
@@ -350,8 +497,9 @@ class SecretsBackedAuthProvider(RequestAuthProvider, ABC):
             return None
 
         try:
-            secret_data = self._fetch_secret_cached()
-            return None if not secret_data else self._create_auth(secret_data)
+            config = self._resolved_config()
+            secret_data = self._fetch_secret_cached(config)
+            return None if not secret_data else self._try_create_auth(secret_data, config)
         except Exception as e:  # pragma: no cover — defensive guard
             safe_log(self.logger, logging.ERROR, ERROR_UNEXPECTED_PROVIDER.format(provider=self.provider_name, error=e))
             return None
@@ -372,8 +520,7 @@ class SecretsBackedAuthProvider(RequestAuthProvider, ABC):
             safe_log(self.logger, logging.DEBUG, DEBUG_PROVIDER_NOT_ENABLED.format(provider=self.provider_name))
             return None
 
-        allowed_hosts = get_allowed_hosts()
-        if not is_host_allowed(url, allowed_hosts):
+        if not self._is_host_allowed(url):
             hostname = urlparse(url).hostname or "<unknown>"
             safe_log(
                 self.logger,
@@ -383,11 +530,12 @@ class SecretsBackedAuthProvider(RequestAuthProvider, ABC):
             return None
 
         try:
-            secret_data = self._fetch_secret_cached()
+            config = self._resolved_config()
+            secret_data = self._fetch_secret_cached(config)
             if not secret_data:
                 safe_log(self.logger, logging.WARNING, WARNING_FETCH_FAILED.format(provider=self.provider_name))
                 return None
-            return self._create_auth(secret_data)
+            return self._try_create_auth(secret_data, config)
         except ValueError as e:
             # Configuration or parsing error — not fatal to the request.
             safe_log(self.logger, logging.WARNING, WARNING_CONFIG_ERROR.format(provider=self.provider_name, error=e))
@@ -401,11 +549,38 @@ class SecretsBackedAuthProvider(RequestAuthProvider, ABC):
     def _is_enabled(self) -> bool:
         """Check whether this provider is enabled via configuration.
 
+        The verdict is cached against the raw values of the two enable flags, so
+        repeated calls only re-parse configuration when one of them changes.
+
         Returns:
             True if the provider is enabled, False otherwise.
 
         """
-        return is_provider_enabled(self.provider_name)
+        snapshot = (os.environ.get(ENV_AUTH_ENABLE), os.environ.get(self._enable_env_key))
+        if snapshot != self._enabled_snapshot:
+            self._enabled = is_provider_enabled(self.provider_name)
+            self._enabled_snapshot = snapshot
+        return self._enabled
+
+    def _is_host_allowed(self, url: str) -> bool:
+        """Check the URL's host against the configured allowlist.
+
+        The allowlist is parsed once per distinct value of MLFLOW_SECRETS_ALLOWED_HOSTS;
+        `is_host_allowed` caches its compiled form (exact-host set plus wildcard regex).
+
+        Args:
+            url: Full request URL.
+
+        Returns:
+            True if allowed (or no allowlist configured), otherwise False.
+
+        """
+        raw = os.environ.get(ENV_ALLOWED_HOSTS)
+        if raw != self._allowed_hosts_raw:
+            hosts = get_allowed_hosts()
+            self._allowed_hosts = None if hosts is None else tuple(hosts)
+            self._allowed_hosts_raw = raw
+        return is_host_allowed(url, self._allowed_hosts)
 
     def _validated_ttl(self) -> int:
         """Validate TTL while remaining compatible with different `validate_ttl` signatures.
@@ -430,15 +605,40 @@ class SecretsBackedAuthProvider(RequestAuthProvider, ABC):
                 )
                 return self.default_ttl
 
-    def _fetch_secret_cached(self) -> SecretData | None:
+    def _resolved_config(self) -> tuple[str, AuthMode, int]:
+        """Return the provider's global cache key, auth mode and validated TTL.
+
+        The cache key is already prefixed with the provider name. Providers that declare
+        `_config_env_vars` get all three memoized against the raw values of those
+        variables; others are re-resolved on every call.
+
+        Returns:
+            A `(cache_key, auth_mode, ttl)` tuple.
+
+        """
+        if not self._config_env_vars:
+            return self._build_config()
+        snapshot = tuple(os.environ.get(name) for name in self._config_env_vars)
+        if self._config is None or snapshot != self._config_snapshot:
+            self._config = self._build_config()
+            self._config_snapshot = snapshot
+        return self._config
+
+    def _build_config(self) -> tuple[str, AuthMode, int]:
+        """Resolve the `(cache_key, auth_mode, ttl)` tuple from the provider hooks."""
+        return f"{self.provider_name}:{self._get_cache_key()}", self._get_auth_mode(), self._validated_ttl()
+
+    def _fetch_secret_cached(self, config: tuple[str, AuthMode, int] | None = None) -> SecretData | None:
         """Fetch and parse the secret with caching and TTL validation.
 
+        Args:
+            config: Already-resolved `(cache_key, auth_mode, ttl)`; resolved here when omitted.
+
         Returns:
             Parsed `SecretData` dict or None when not available.
 
         """
-        cache_key = f"{self.provider_name}:{self._get_cache_key()}"
-        ttl = self._validated_ttl()
+        cache_key, _, ttl = config or self._resolved_config()
 
         @cached_fetch(cache_key, ttl)
         def _fetch() -> SecretData | None:
@@ -449,6 +649,31 @@ class SecretsBackedAuthProvider(RequestAuthProvider, ABC):
 
         return _fetch()
 
+    def _try_create_auth(
+        self,
+        secret: SecretData,
+        config: tuple[str, AuthMode, int],
+    ) -> requests.auth.AuthBase | None:
+        """Create an Auth object, or log and return None if the secret doesn't fit the auth mode.
+
+        The mismatch is detected up front rather than by catching the `ValueError` from
+        `_create_auth`, so a persistently malformed secret costs no exception per request.
+
+        Args:
+            secret: Parsed secret data.
+            config: The `(cache_key, auth_mode, ttl)` resolved for this request.
+
+        Returns:
+            The wrapped Auth object, or None when the secret is unusable.
+
+        """
+        cache_key, auth_mode, _ = config
+        error = _secret_mode_error(secret, auth_mode)
+        if error is not None:
+            safe_log(self.logger, logging.WARNING, WARNING_CONFIG_ERROR.format(provider=self.provider_name, error=error))
+            return None
+        return self._build_auth(secret, cache_key, auth_mode)
+
     def _create_auth(self, secret: SecretData) -> requests.auth.AuthBase:
         """Create a `requests` Auth object from parsed secret material.
 
@@ -461,13 +686,31 @@ class SecretsBackedAuthProvider(RequestAuthProvider, ABC):
             secret: Parsed secret data.
 
         Returns:
-            A concrete `requests.auth.AuthBase` instance wrapped with auto-refresh capability.
+            A concrete `requests.auth.AuthBase` instance, wrapped with auto-refresh capability
+            unless MLFLOW_SECRETS_AUTOREFRESH disables it.
 
         Raises:
             ValueError: On invalid combinations (e.g., bearer mode with username/password).
 
         """
-        auth_mode: AuthMode = self._get_auth_mode()
+        cache_key, auth_mode, _ = self._resolved_config()
+        error = _secret_mode_error(secret, auth_mode)
+        if error is not None:
+            raise ValueError(error)
+        return self._build_auth(secret, cache_key, auth_mode)
+
+    def _build_auth(self, secret: SecretData, cache_key: str, auth_mode: AuthMode) -> requests.auth.AuthBase:
+        """Build the Auth object for a secret already validated against `auth_mode`.
+
+        Args:
+            secret: Parsed secret data compatible with `auth_mode`.
+            cache_key: Provider-prefixed cache key to invalidate on auth failure.
+            auth_mode: Configured authentication mode.
+
+        Returns:
+            The Auth object, wrapped with auto-refresh unless it is disabled.
+
+        """
         header_name = _normalize_header_name(get_auth_header_name())
 
         # Create the underlying auth object
@@ -478,9 +721,6 @@ class SecretsBackedAuthProvider(RequestAuthProvider, ABC):
             token = secret[SECRET_FIELD_TOKEN]
             if auth_mode == AUTH_MODE_BASIC:
                 # Accept token in the form "username:password" for convenience.
-                if ":" not in token:
-                    msg = ERROR_BASIC_TOKEN_FORMAT
-                    raise ValueError(msg)
                 username, password = token.split(":", 1)
                 auth = BasicAuth(username, password, header_name)
             elif header_name == DEFAULT_AUTH_HEADER:
@@ -490,16 +730,14 @@ class SecretsBackedAuthProvider(RequestAuthProvider, ABC):
                 auth = CustomHeaderAuth(token, header_name)
 
         # Username/password provisioned
-        elif SECRET_FIELD_USERNAME in secret and SECRET_FIELD_PASSWORD in secret:
-            if auth_mode == AUTH_MODE_BEARER:
-                msg = ERROR_BEARER_WITH_USERPASS
-                raise ValueError(msg)
-            auth = BasicAuth(secret[SECRET_FIELD_USERNAME], secret[SECRET_FIELD_PASSWORD], header_name)
         else:
-            raise ValueError(ERROR_SECRET_MISSING_TOKEN_OR_CREDS)
+            auth = BasicAuth(secret[SECRET_FIELD_USERNAME], secret[SECRET_FIELD_PASSWORD], header_name)
+
+        # Skip the per-response hook entirely when auto-refresh is turned off
+        if not is_auto_refresh_enabled():
+            return auth
 
         # Wrap with auto-refresh functionality
-        cache_key = f"{self.provider_name}:{self._get_cache_key()}"
         return _AutoRefreshAuth(auth, self, cache_key)
 
     # Abstracts for concrete providers
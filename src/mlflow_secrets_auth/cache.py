@@ -4,8 +4,12 @@ Provides a lightweight, thread-safe cache with monotonic-clock-based TTLs and a
 simple decorator (`cached_fetch`) to memoize zero-argument callables.
 
 Design goals:
-  * Monotonic time to avoid issues when the wall clock changes.
-  * Thread safety via `RLock`.
+  * Monotonic time to avoid issues when the wall clock changes, kept as integer
+    nanoseconds so expiry checks are exact integer comparisons.
+  * Thread safety via `RLock` for mutations; reads are lock-free, relying on
+    single dict lookups being atomic in CPython.
+  * O(1) keyed lookups with lazy expiry, plus an expiry min-heap so bulk pruning
+    only touches entries that have actually expired.
   * No caching of failures: exceptions from the wrapped callable return `None`
     and are not stored.
   * Global cache instance for convenience, with helpers to clear and inspect size.
@@ -13,6 +17,7 @@ Design goals:
 
 from __future__ import annotations
 
+import heapq
 import threading
 import time
 from collections.abc import Callable
@@ -21,21 +26,47 @@ from typing import Any, TypeVar
 from .constants import DEFAULT_TTL_SECONDS, MIN_TTL_SECONDS, MAX_TTL_SECONDS
 T = TypeVar("T")
 
+_NS_PER_SECOND = 1_000_000_000
+
 
 class TTLCache:
     """Thread-safe TTL cache (monotonic-clock based)."""
 
-    __slots__ = ("_cache", "_lock")
+    __slots__ = ("_cache", "_expiry_heap", "_lock")
 
     def __init__(self) -> None:
         """Initialize an empty TTL cache with thread safety."""
-        self._cache: dict[str, tuple[Any, float]] = {}
+        self._cache: dict[str, tuple[Any, int]] = {}
+        # (expiry_ns, key) pairs; entries may be stale after an overwrite or delete
+        self._expiry_heap: list[tuple[int, str]] = []
         self._lock = threading.RLock()
 
     @staticmethod
-    def _now() -> float:
-        """Return a monotonically increasing timestamp."""
-        return time.monotonic()
+    def _now() -> int:
+        """Return a monotonically increasing timestamp in nanoseconds."""
+        return time.monotonic_ns()
+
+    def _prune_expired(self, now: int) -> None:
+        """Drop expired entries by popping due items off the expiry heap.
+
+        Must be called with the lock held.
+
+        Args:
+            now: Current monotonic timestamp in nanoseconds.
+
+        """
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            expiry, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            # Skip stale heap items whose key was overwritten or removed
+            if entry is not None and entry[1] == expiry:
+                del self._cache[key]
+
+        # Overwrites leave stale items behind; rebuild once they dominate
+        if len(heap) > 2 * len(self._cache) + 64:
+            self._expiry_heap = [(exp, key) for key, (_, exp) in self._cache.items()]
+            heapq.heapify(self._expiry_heap)
 
     def get(self, key: str) -> Any | None:
         """Get a value from the cache if present and not expired.
@@ -47,15 +78,18 @@ class TTLCache:
             The cached value if present and valid, otherwise None.
 
         """
-        with self._lock:
-            entry = self._cache.get(key)
-            if entry is None:
-                return None
-            value, expiry = entry
-            if self._now() > expiry:
-                self._cache.pop(key, None)
-                return None
-            return value
+        # Lock-free: entries are immutable tuples swapped in whole under the lock
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        value, expiry = entry
+        if self._now() > expiry:
+            with self._lock:
+                # Only drop the entry we saw; a concurrent set may have replaced it
+                if self._cache.get(key) is entry:
+                    del self._cache[key]
+            return None
+        return value
 
     def set(self, key: str, value: Any, ttl_seconds: float) -> None:
         """Set a value in the cache with a TTL.
@@ -73,8 +107,12 @@ class TTLCache:
             if ttl_seconds < MIN_TTL_SECONDS:
                 self._cache.pop(key, None)
                 return
-            ttl = min(float(ttl_seconds), float(MAX_TTL_SECONDS))
-            self._cache[key] = (value, self._now() + ttl)
+            ttl_ns = int(min(float(ttl_seconds), float(MAX_TTL_SECONDS)) * _NS_PER_SECOND)
+            now = self._now()
+            expiry = now + ttl_ns
+            self._cache[key] = (value, expiry)
+            heapq.heappush(self._expiry_heap, (expiry, key))
+            self._prune_expired(now)
 
     def delete(self, key: str) -> None:
         """Remove a key from the cache.
@@ -90,6 +128,7 @@ class TTLCache:
         """Clear all cached items."""
         with self._lock:
             self._cache.clear()
+            self._expiry_heap.clear()
 
     def invalidate_prefix(self, prefix: str) -> None:
         """Remove all keys starting with a prefix.
@@ -113,10 +152,7 @@ class TTLCache:
 
         """
         with self._lock:
-            now = self._now()
-            to_delete = [k for k, (_, exp) in self._cache.items() if now > exp]
-            for k in to_delete:
-                self._cache.pop(k, None)
+            self._prune_expired(self._now())
             return len(self._cache)
 
 
@@ -8,10 +8,12 @@ Key env vars:
   * MLFLOW_SECRETS_LOG_LEVEL: Logging level (defaults to "INFO").
   * MLFLOW_SECRETS_AUTH_ENABLE: Comma-separated list of enabled providers.
   * MLFLOW_SECRETS_AUTH_ENABLE_<PROVIDER>: Per-provider boolean toggle (e.g., AWS_SECRETS_MANAGER).
+  * MLFLOW_SECRETS_AUTOREFRESH: Boolean toggle for refresh-and-retry on 401/403 (defaults to on).
 """
 
 from __future__ import annotations
 
+import functools
 import os
 import re
 from typing import Final
@@ -25,6 +27,7 @@ from .constants import (
     ENV_AUTH_HEADER_NAME,
     ENV_LOG_LEVEL,
     ENV_AUTH_ENABLE,
+    ENV_AUTO_REFRESH,
     TRUTHY_VALUES,
     ENV_AUTH_ENABLE_PREFIX,
 )
@@ -103,11 +106,26 @@ def get_allowed_hosts() -> list[str] | None:
         A list of hostname patterns, or None if not configured.
 
     """
-    hosts_str = get_env_var(ENV_ALLOWED_HOSTS)
+    hosts = _parse_allowed_hosts(get_env_var(ENV_ALLOWED_HOSTS))
+    return list(hosts) if hosts else None
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_allowed_hosts(hosts_str: str | None) -> tuple[str, ...]:
+    """Split a raw allowlist value into stripped, non-empty patterns.
+
+    Cached on the raw string so repeated lookups skip the split/strip work.
+
+    Args:
+        hosts_str: Raw MLFLOW_SECRETS_ALLOWED_HOSTS value.
+
+    Returns:
+        Tuple of hostname patterns (empty when unset or blank).
+
+    """
     if not hosts_str:
-        return None
-    hosts = [h.strip() for h in hosts_str.split(",") if h.strip()]
-    return hosts or None
+        return ()
+    return tuple(h.strip() for h in hosts_str.split(",") if h.strip())
 
 
 def get_auth_header_name() -> str:
@@ -122,6 +140,18 @@ def get_auth_header_name() -> str:
     return get_env_var(ENV_AUTH_HEADER_NAME, DEFAULT_AUTH_HEADER) or DEFAULT_AUTH_HEADER
 
 
+def is_auto_refresh_enabled() -> bool:
+    """Return whether auth objects should refresh credentials and retry on 401/403.
+
+    Enabled unless MLFLOW_SECRETS_AUTOREFRESH is set to a non-truthy value (e.g., "0").
+
+    Returns:
+        True if auto-refresh is enabled, False otherwise.
+
+    """
+    return get_env_bool(ENV_AUTO_REFRESH, True)
+
+
 def get_log_level() -> str:
     """Return the configured log level for secrets auth.
 
@@ -134,6 +164,19 @@ def get_log_level() -> str:
     return (get_env_var(ENV_LOG_LEVEL, DEFAULT_LOG_LEVEL) or DEFAULT_LOG_LEVEL).upper()
 
 
+def provider_enable_env_key(provider_name: str) -> str:
+    """Return the per-provider enable variable name for a provider slug.
+
+    Args:
+        provider_name: Provider slug, e.g. "aws-secrets-manager".
+
+    Returns:
+        The variable name, e.g. "MLFLOW_SECRETS_AUTH_ENABLE_AWS_SECRETS_MANAGER".
+
+    """
+    return f"{ENV_AUTH_ENABLE_PREFIX}{provider_name.upper().replace('-', '_')}"
+
+
 def is_provider_enabled(provider_name: str) -> bool:
     """Return whether a specific provider is enabled.
 
@@ -150,14 +193,29 @@ def is_provider_enabled(provider_name: str) -> bool:
 
     """
     # Global list
-    global_enable = get_env_var(ENV_AUTH_ENABLE, "") or ""
-    enabled = {p.strip().lower() for p in global_enable.split(",") if p.strip()}
-    if provider_name.strip().lower() in enabled:
+    if provider_name.strip().lower() in _parse_enabled_providers(get_env_var(ENV_AUTH_ENABLE)):
         return True
 
     # Provider-specific toggle
-    env_key = f"{ENV_AUTH_ENABLE_PREFIX}{provider_name.upper().replace('-', '_')}"
-    return get_env_bool(env_key, False)
+    return get_env_bool(provider_enable_env_key(provider_name), False)
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_enabled_providers(global_enable: str | None) -> frozenset[str]:
+    """Parse the global enable list into a set of lowercased provider slugs.
+
+    Cached on the raw string so each provider check is a single set lookup.
+
+    Args:
+        global_enable: Raw MLFLOW_SECRETS_AUTH_ENABLE value.
+
+    Returns:
+        Frozen set of enabled provider names.
+
+    """
+    if not global_enable:
+        return frozenset()
+    return frozenset(p.strip().lower() for p in global_enable.split(",") if p.strip())
 
 
 def mask_secret(value: str, mask_char: str = DEFAULT_MASK_CHAR, show_chars: int = DEFAULT_SHOW_CHARS) -> str:
@@ -250,7 +308,9 @@ __all__ = [
     "get_env_int",
     "get_env_var",
     "get_log_level",
+    "is_auto_refresh_enabled",
     "is_provider_enabled",
     "mask_secret",
+    "provider_enable_env_key",
     "redact_sensitive_data",
 ]
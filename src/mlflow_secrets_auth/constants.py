@@ -17,6 +17,7 @@ ENV_ALLOWED_HOSTS: Final[str] = "MLFLOW_SECRETS_ALLOWED_HOSTS"
 ENV_AUTH_HEADER_NAME: Final[str] = "MLFLOW_AUTH_HEADER_NAME"
 ENV_LOG_LEVEL: Final[str] = "MLFLOW_SECRETS_LOG_LEVEL"
 ENV_AUTH_ENABLE: Final[str] = "MLFLOW_SECRETS_AUTH_ENABLE"
+ENV_AUTO_REFRESH: Final[str] = "MLFLOW_SECRETS_AUTOREFRESH"
 
 # Environment variable prefixes
 ENV_AUTH_ENABLE_PREFIX = "MLFLOW_SECRETS_AUTH_ENABLE_"
@@ -88,6 +89,16 @@ HEADER_AUTHORIZATION: Final[str] = "Authorization"
 HEADER_RETRY_MARKER: Final[str] = "X-MLFSA-Retried"
 HEADER_RETRY_VALUE: Final[str] = "true"
 
+# Response status codes that trigger a credential refresh and single retry
+AUTH_ERROR_STATUS_CODES: Final[frozenset[int]] = frozenset({401, 403})
+
+# Connection pool for auth-refresh retries that have no originating adapter
+RETRY_POOL_CONNECTIONS: Final[int] = 10
+RETRY_POOL_MAXSIZE: Final[int] = 10
+
+# How long concurrent auth failures wait for an in-flight credential refresh
+REFRESH_WAIT_TIMEOUT_SECONDS: Final[float] = 30.0
+
 # =============================================================================
 # Package Names (for install instructions)
 # =============================================================================
@@ -46,6 +46,8 @@ class AWSSecretsManagerAuthProvider(SecretsBackedAuthProvider):
         MLFLOW_AWS_TTL_SEC: Cache TTL in seconds (defaults to provider's default TTL).
     """
 
+    _config_env_vars = (ENV_AWS_SECRET_ID, ENV_AWS_REGION, ENV_AWS_AUTH_MODE, ENV_AWS_TTL_SEC)
+
     def __init__(self) -> None:
         """Initialize the provider with a default TTL and lazy AWS client."""
         super().__init__(PROVIDER_AWS, default_ttl=DEFAULT_TTL_SECONDS)
@@ -46,6 +46,8 @@ class AzureKeyVaultAuthProvider(SecretsBackedAuthProvider):
         MLFLOW_AZURE_TTL_SEC: Cache TTL in seconds (defaults to provider's default TTL).
     """
 
+    _config_env_vars = (ENV_AZURE_VAULT_URL, ENV_AZURE_SECRET_NAME, ENV_AZURE_AUTH_MODE, ENV_AZURE_TTL_SEC)
+
     def __init__(self) -> None:
         """Initialize the provider with a default TTL and a lazy SecretClient."""
         super().__init__(PROVIDER_AZURE, default_ttl=DEFAULT_TTL_SECONDS)
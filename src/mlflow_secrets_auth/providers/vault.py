@@ -68,6 +68,8 @@ class VaultAuthProvider(SecretsBackedAuthProvider):
 
     """
 
+    _config_env_vars = (ENV_VAULT_SECRET_PATH, ENV_VAULT_ADDR, ENV_VAULT_AUTH_MODE, ENV_VAULT_TTL_SEC)
+
     def __init__(self) -> None:
         """Initialize the provider with a default TTL and a lazy hvac client."""
         super().__init__(PROVIDER_VAULT, default_ttl=DEFAULT_TTL_SECONDS)
@@ -12,12 +12,15 @@ This module centralizes:
 from __future__ import annotations
 
 import fnmatch
+import functools
+import ipaddress
 import json
 import logging
 import random
+import re
 import time
-from typing import Any, TypeVar
-from collections.abc import Callable
+from typing import Any, NamedTuple, TypeVar
+from collections.abc import Callable, Sequence
 from urllib.parse import urlparse
 from .constants import (
     DEFAULT_MASK_CHAR,
@@ -166,7 +169,152 @@ def parse_secret_json(secret_value: str) -> dict[str, str]:
     )
 
 
-def is_host_allowed(url: str, allowed_hosts: list[str] | None) -> bool:
+# "scheme://authority" with a printable ASCII authority, followed by the end of
+# the URL or a path, query or fragment delimiter
+_PLAIN_AUTHORITY_RE = re.compile(r"[A-Za-z][A-Za-z0-9+.\-]*://([!-~]*?)(?:[/?#]|\Z)")
+
+
+def _extract_host(url: str) -> str | None:
+    """Return the lowercased hostname of a URL, as `urlparse(url).hostname` would.
+
+    Plain ``scheme://host[:port]`` URLs are split with one regex match instead
+    of building a ParseResult. Anything else (IPv6 literals, whitespace,
+    non-ASCII or schemeless input) goes through `urlparse`, and URLs it
+    rejects yield None so the allowlist denies them. Bracketed hosts must be
+    IPv6 literals; older Pythons' `urlparse` accepts any bracketed text.
+
+    Args:
+        url: Full URL.
+
+    Returns:
+        Lowercased hostname, or None when the URL has no valid network location.
+
+    """
+    match = _PLAIN_AUTHORITY_RE.match(url)
+    if match is None or "[" in match[1] or "]" in match[1]:
+        try:
+            parsed = urlparse(url)
+            hostname = parsed.hostname
+            if hostname and parsed.netloc.rpartition("@")[2].startswith("["):
+                ipaddress.IPv6Address(hostname)
+        except ValueError:
+            return None
+        return hostname
+    host = match[1].rpartition("@")[2].partition(":")[0]
+    return host.lower() or None
+
+
+def _is_wildcard(pattern: str) -> bool:
+    """Return whether an allowlist entry uses shell-style wildcard syntax."""
+    return any(ch in pattern for ch in "*?[")
+
+
+def _is_subdomain_pattern(pattern: str) -> bool:
+    """Return whether an entry is a plain ``*.<domain>`` suffix pattern."""
+    return pattern.startswith("*.") and not _is_wildcard(pattern[2:])
+
+
+def _is_prefix_pattern(pattern: str) -> bool:
+    """Return whether an entry is a plain ``<prefix>*`` pattern."""
+    return len(pattern) > 1 and pattern.endswith("*") and not _is_wildcard(pattern[:-1])
+
+
+def _min_match_len(pattern: str) -> int:
+    """Return a lower bound on the length of any hostname a glob can match.
+
+    ``*`` may match nothing and every other character consumes at least one.
+    Character classes are not parsed; counting stops at the first ``[``, which
+    keeps the bound safe.
+    """
+    static = pattern.partition("[")[0]
+    return len(static) - static.count("*")
+
+
+class _HostAllowlist(NamedTuple):
+    """Compiled form of a host allowlist."""
+
+    exact: frozenset[str]
+    suffixes: frozenset[str]
+    prefixes: tuple[str, ...]
+    wildcard: re.Pattern[str] | None
+    wildcard_min_len: int
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_host_patterns(patterns: tuple[str, ...]) -> _HostAllowlist:
+    """Split allowlist patterns into exact hosts, domain suffixes, prefixes and one regex.
+
+    Cached on the pattern tuple, so an allowlist is compiled once rather than
+    translated pattern by pattern on every lookup. ``*.<domain>`` entries,
+    the common case, become suffix lookups and ``<prefix>*`` entries a single
+    ``str.startswith`` call instead of regex alternatives.
+
+    Args:
+        patterns: Hostname patterns (exact names or shell-style globs).
+
+    Returns:
+        The lowercased exact hostnames, the lowercased domains from
+        ``*.<domain>`` entries, the lowercased prefixes from ``<prefix>*``
+        entries, an anchored alternation of the remaining
+        lowercased wildcard patterns (None when there are none) and the
+        shortest hostname length that alternation can match.
+
+    """
+    exact = frozenset(p.lower() for p in patterns if not _is_wildcard(p))
+    suffixes = frozenset(p[2:].lower() for p in patterns if _is_subdomain_pattern(p))
+    prefixes = tuple(dict.fromkeys(p[:-1].lower() for p in patterns if _is_prefix_pattern(p)))
+    wildcards = [
+        p.lower()
+        for p in patterns
+        if _is_wildcard(p) and not _is_subdomain_pattern(p) and not _is_prefix_pattern(p)
+    ]
+    if not wildcards:
+        return _HostAllowlist(exact, suffixes, prefixes, None, 0)
+    return _HostAllowlist(
+        exact,
+        suffixes,
+        prefixes,
+        re.compile("|".join(fnmatch.translate(p) for p in wildcards)),
+        min(_min_match_len(p) for p in wildcards),
+    )
+
+
+@functools.lru_cache(maxsize=512)
+def _host_matches(hostname: str, patterns: tuple[str, ...]) -> bool:
+    """Return whether a lowercased hostname matches any allowlist pattern.
+
+    Results are cached per (hostname, allowlist); clients typically talk to
+    one tracking server, so repeated checks become a single dict lookup.
+
+    Args:
+        hostname: Lowercased hostname.
+        patterns: Hostname patterns (exact names or shell-style globs).
+
+    Returns:
+        True if the hostname is an exact entry or matches a wildcard pattern.
+
+    """
+    allowlist = _compile_host_patterns(patterns)
+    if hostname in allowlist.exact:
+        return True
+    if allowlist.suffixes:
+        # "*.<domain>" matches any host ending in ".<domain>"
+        dot = hostname.find(".")
+        while dot != -1:
+            if hostname[dot + 1:] in allowlist.suffixes:
+                return True
+            dot = hostname.find(".", dot + 1)
+    # "<prefix>*" matches any host starting with "<prefix>"
+    if hostname.startswith(allowlist.prefixes):
+        return True
+    return (
+        allowlist.wildcard is not None
+        and len(hostname) >= allowlist.wildcard_min_len
+        and allowlist.wildcard.match(hostname) is not None
+    )
+
+
+def is_host_allowed(url: str, allowed_hosts: Sequence[str] | None) -> bool:
     """Return whether the URL's host is in the provided allowlist.
 
     Supports exact hostname matches and wildcard patterns using shell-style
@@ -190,21 +338,12 @@ def is_host_allowed(url: str, allowed_hosts: list[str] | None) -> bool:
     if allowed_hosts is None:
         return True
     try:
-        hostname = urlparse(url).hostname
-        if not hostname:
+        hostname = _extract_host(url)
+        if not hostname or not allowed_hosts:
             return False
 
-        # Normalize hostname to lowercase for case-insensitive comparison
-        hostname = hostname.lower()
-
-        # Check each pattern in the allowlist
-        for pattern in allowed_hosts:
-            # Normalize pattern to lowercase as well
-            pattern_lower = pattern.lower()
-            if fnmatch.fnmatch(hostname, pattern_lower):
-                return True
-
-        return False
+        # Hostnames are lowercased; the compiled patterns are lowercased as well
+        return _host_matches(hostname, tuple(allowed_hosts))
     except Exception:
         return False
 
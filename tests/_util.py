@@ -0,0 +1,40 @@
+"""Shared helpers for the test suite."""
+
+from types import SimpleNamespace
+
+# Environment variable prefixes owned by the plugin and its providers
+ENV_PREFIXES = ('MLFLOW_', 'VAULT_', 'AWS_', 'AZURE_')
+
+
+def fake_request(headers=None):
+    """Return a minimal stand-in for ``requests.PreparedRequest``."""
+    return SimpleNamespace(
+        method="GET",
+        url="https://mlflow.example.com/api/2.0/mlflow/experiments/list",
+        headers=dict(headers or {}),
+        body=None,
+        hooks={},
+        _cookies=None,
+        _body_position=None,
+    )
+
+
+class RecordingFake:
+    """Callable that records its arguments and returns a fixed value.
+
+    A lighter alternative to ``Mock`` where tests only need to check how often
+    and with which objects (by identity) it was called.
+    """
+
+    def __init__(self, return_value=None):
+        self.calls = []
+        self.return_value = return_value
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return self.return_value
+
+
+def fake_response(status_code, request=None, connection=None):
+    """Return a minimal stand-in for ``requests.Response``."""
+    return SimpleNamespace(status_code=status_code, request=request, connection=connection)
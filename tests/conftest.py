@@ -3,65 +3,70 @@
 import os
 import pytest
 
+from mlflow_secrets_auth import cache
+from tests._util import ENV_PREFIXES
 
-@pytest.fixture(autouse=True)
-def clean_environment():
-    """Clean up environment variables and cache before and after each test."""
-    # Clear cache before test
-    from mlflow_secrets_auth.cache import clear_cache
-    clear_cache()
 
-    # Store original values
-    original_env = {}
-    for key, value in os.environ.items():
-        if key.startswith(('MLFLOW_', 'VAULT_', 'AWS_', 'AZURE_')):
-            original_env[key] = value
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    """Swap the global secret cache for an empty instance for one test."""
+    new_cache = cache.TTLCache()
+    monkeypatch.setattr(cache, "_global_cache", new_cache)
+    return new_cache
+
 
-    # Clear test-related environment variables
-    for key in list(os.environ.keys()):
-        if key.startswith(('MLFLOW_', 'VAULT_', 'AWS_', 'AZURE_')):
-            del os.environ[key]
+@pytest.fixture(scope="session")
+def ambient_env_keys():
+    """Return the plugin-related variables set in the environment at session start.
 
-    yield
+    ``os.environ`` is scanned once; tests set their own variables through
+    ``monkeypatch``, so nothing new survives past the test that added it.
+    """
+    return tuple(k for k in os.environ if k.startswith(ENV_PREFIXES))
 
-    # Clear cache after test
-    clear_cache()
 
-    # Restore original environment
-    for key in list(os.environ.keys()):
-        if key.startswith(('MLFLOW_', 'VAULT_', 'AWS_', 'AZURE_')):
-            del os.environ[key]
+@pytest.fixture(autouse=True)
+def clean_environment(monkeypatch, fresh_cache, ambient_env_keys):
+    """Isolate environment variables and the secret cache for each test.
 
-    for key, value in original_env.items():
-        os.environ[key] = value
+    Ambient variables are removed through ``monkeypatch`` so that only the
+    touched keys are recorded and restored when the test finishes. The cache
+    is a fresh instance, so nothing has to be flushed before or after.
+    """
+    # Clear test-related environment variables (restored by monkeypatch)
+    for key in ambient_env_keys:
+        monkeypatch.delenv(key, raising=False)
 
 
 @pytest.fixture
-def vault_env():
+def vault_env(monkeypatch):
     """Set up Vault environment variables for testing."""
-    os.environ.update({
+    for key, value in {
         "MLFLOW_SECRETS_AUTH_ENABLE": "vault",
         "VAULT_ADDR": "https://vault.example.com",
         "VAULT_TOKEN": "test-token",
         "MLFLOW_VAULT_SECRET_PATH": "secret/data/mlflow",
-    })
+    }.items():
+        monkeypatch.setenv(key, value)
 
 
 @pytest.fixture
-def aws_env():
+def aws_env(monkeypatch):
     """Set up AWS environment variables for testing."""
-    os.environ.update({
+    for key, value in {
         "MLFLOW_SECRETS_AUTH_ENABLE": "aws-secrets-manager",
         "AWS_REGION": "us-west-2",
         "MLFLOW_AWS_SECRET_ID": "mlflow-auth-secret",
-    })
+    }.items():
+        monkeypatch.setenv(key, value)
 
 
 @pytest.fixture
-def azure_env():
+def azure_env(monkeypatch):
     """Set up Azure environment variables for testing."""
-    os.environ.update({
+    for key, value in {
         "MLFLOW_SECRETS_AUTH_ENABLE": "azure-key-vault",
         "AZURE_KEY_VAULT_URL": "https://test-keyvault.vault.azure.net/",
         "MLFLOW_AZURE_SECRET_NAME": "mlflow-auth-secret",
-    })
+    }.items():
+        monkeypatch.setenv(key, value)
@@ -1,29 +1,25 @@
 """Integration tests for auto-refresh functionality."""
 
 import json
-import os
 from unittest.mock import Mock, patch
 
+import pytest
 import requests
 
+from mlflow_secrets_auth.base import _AutoRefreshAuth
 from mlflow_secrets_auth.providers.aws_secrets_manager import AWSSecretsManagerAuthProvider
+from tests._util import fake_request
 
+# Secret payloads are serialized once rather than on every mocked fetch
+_ORIGINAL_SECRET = json.dumps({'token': 'original-token-123'})
+_REFRESHED_SECRET = json.dumps({'token': 'refreshed-token-456'})
+_SUCCESS_SECRET = json.dumps({'token': 'success-token'})
 
+
+@pytest.mark.usefixtures("aws_env")
 class TestAutoRefreshIntegration:
     """Integration tests for auto-refresh functionality with real providers."""
 
-    def setup_method(self):
-        """Setup test environment."""
-        # Clear any existing environment variables
-        for key in os.environ.copy():
-            if key.startswith(('MLFLOW_', 'AWS_')):
-                del os.environ[key]
-
-        # Set required environment variables
-        os.environ["MLFLOW_SECRETS_AUTH_ENABLE"] = "aws-secrets-manager"
-        os.environ["AWS_REGION"] = "us-west-2"
-        os.environ["MLFLOW_AWS_SECRET_ID"] = "mlflow-auth-secret"
-
     @patch('boto3.client')
     @patch('requests.Session.send')
     def test_aws_provider_auto_refresh_on_401(self, mock_send, mock_boto_client):
@@ -38,19 +34,8 @@ class TestAutoRefreshIntegration:
         def mock_get_secret_value(*args, **kwargs):
             nonlocal call_count
             call_count += 1
-            if call_count == 1:
-                # First call returns original token
-                return {
-                    'SecretString': json.dumps({
-                        'token': 'original-token-123',
-                    }),
-                }
-            # Subsequent calls return refreshed token
-            return {
-                'SecretString': json.dumps({
-                    'token': 'refreshed-token-456',
-                }),
-            }
+            # First call returns original token, subsequent calls the refreshed one
+            return {'SecretString': _ORIGINAL_SECRET if call_count == 1 else _REFRESHED_SECRET}
 
         mock_client.get_secret_value.side_effect = mock_get_secret_value
 
@@ -58,15 +43,10 @@ class TestAutoRefreshIntegration:
         auth = provider.get_auth()
 
         # Verify we got an auto-refresh auth wrapper
-        from mlflow_secrets_auth.base import _AutoRefreshAuth
         assert isinstance(auth, _AutoRefreshAuth)
 
         # Create a mock request that will receive a 401
-        mock_request = Mock(spec=requests.PreparedRequest)
-        mock_request.headers = {}
-        mock_request.hooks = {}
-        mock_request.copy = Mock(return_value=Mock(spec=requests.PreparedRequest))
-        mock_request.copy.return_value.headers = {}
+        mock_request = fake_request()
 
         # Apply authentication to the request
         authenticated_request = auth(mock_request)
@@ -132,11 +112,7 @@ class TestAutoRefreshIntegration:
         auth = provider.get_auth()
 
         # Create mock request and apply auth
-        mock_request = Mock(spec=requests.PreparedRequest)
-        mock_request.headers = {}
-        mock_request.hooks = {}
-        mock_request.copy = Mock(return_value=Mock(spec=requests.PreparedRequest))
-        mock_request.copy.return_value.headers = {}
+        mock_request = fake_request()
 
         authenticated_request = auth(mock_request)
 
@@ -171,11 +147,7 @@ class TestAutoRefreshIntegration:
         def mock_get_secret_value(*args, **kwargs):
             nonlocal call_count
             call_count += 1
-            return {
-                'SecretString': json.dumps({
-                    'token': 'success-token',
-                }),
-            }
+            return {'SecretString': _SUCCESS_SECRET}
 
         mock_client.get_secret_value.side_effect = mock_get_secret_value
 
@@ -183,9 +155,7 @@ class TestAutoRefreshIntegration:
         auth = provider.get_auth()
 
         # Create mock request
-        mock_request = Mock(spec=requests.PreparedRequest)
-        mock_request.headers = {}
-        mock_request.hooks = {}
+        mock_request = fake_request()
 
         authenticated_request = auth(mock_request)
 
@@ -216,9 +186,8 @@ class TestAutoRefreshIntegration:
         auth = provider.get_auth()
 
         # Create mock request with retry header already set
-        mock_request = Mock(spec=requests.PreparedRequest)
+        mock_request = fake_request()
         mock_request.headers = {"X-MLFSA-Retried": "true"}
-        mock_request.hooks = {}
 
         authenticated_request = auth(mock_request)
 
@@ -235,9 +204,3 @@ class TestAutoRefreshIntegration:
         assert final_response == mock_401_response
         # get_secret_value should only be called once (for initial auth)
         assert mock_client.get_secret_value.call_count == 1
-
-    def teardown_method(self):
-        """Clean up test environment."""
-        for key in os.environ.copy():
-            if key.startswith(('MLFLOW_', 'AWS_')):
-                del os.environ[key]
@@ -1,29 +1,21 @@
 """Integration test for AWS Secrets Manager provider with mocked backend."""
 
+import base64
 import json
-import os
 from unittest.mock import Mock, patch
 
-import requests
+import pytest
+from botocore.exceptions import ClientError
 
+from mlflow_secrets_auth.cache import delete_cache_key
 from mlflow_secrets_auth.providers.aws_secrets_manager import AWSSecretsManagerAuthProvider
+from tests._util import fake_request
 
 
+@pytest.mark.usefixtures("aws_env")
 class TestAWSSecretsManagerIntegration:
     """Integration tests for AWS Secrets Manager provider with mocked backend."""
 
-    def setup_method(self):
-        """Setup test environment."""
-        # Clear any existing environment variables
-        for key in os.environ.copy():
-            if key.startswith(('MLFLOW_', 'AWS_')):
-                del os.environ[key]
-
-        # Set required environment variables
-        os.environ["MLFLOW_SECRETS_AUTH_ENABLE"] = "aws-secrets-manager"
-        os.environ["AWS_REGION"] = "us-west-2"
-        os.environ["MLFLOW_AWS_SECRET_ID"] = "mlflow-auth-secret"
-
     @patch('boto3.client')
     def test_aws_bearer_token_flow(self, mock_boto_client):
         """Test complete flow with AWS Secrets Manager and bearer token."""
@@ -42,9 +34,7 @@ class TestAWSSecretsManagerIntegration:
         auth = provider.get_auth()
 
         # Test the auth object
-        request = Mock(spec=requests.PreparedRequest)
-        request.headers = {}
-        request.hooks = {}
+        request = fake_request()
         auth(request)
 
         assert request.headers["Authorization"] == "Bearer aws-bearer-token-123"
@@ -56,9 +46,9 @@ class TestAWSSecretsManagerIntegration:
         )
 
     @patch('boto3.client')
-    def test_aws_basic_auth_flow(self, mock_boto_client):
+    def test_aws_basic_auth_flow(self, mock_boto_client, monkeypatch):
         """Test complete flow with AWS Secrets Manager and basic auth."""
-        os.environ["MLFLOW_AWS_AUTH_MODE"] = "basic"
+        monkeypatch.setenv("MLFLOW_AWS_AUTH_MODE", "basic")
 
         # Mock boto3 client
         mock_client = Mock()
@@ -76,13 +66,10 @@ class TestAWSSecretsManagerIntegration:
         auth = provider.get_auth()
 
         # Test the auth object
-        request = Mock(spec=requests.PreparedRequest)
-        request.headers = {}
-        request.hooks = {}
+        request = fake_request()
         auth(request)
 
         # Check basic auth header
-        import base64
         expected = base64.b64encode(b"aws-user:aws-pass").decode("ascii")
         assert request.headers["Authorization"] == f"Basic {expected}"
 
@@ -100,7 +87,6 @@ class TestAWSSecretsManagerIntegration:
         mock_boto_client.return_value = mock_client
 
         # Mock secret not found
-        from botocore.exceptions import ClientError
         mock_client.get_secret_value.side_effect = ClientError(
             {'Error': {'Code': 'ResourceNotFoundException'}},
             'GetSecretValue',
@@ -113,9 +99,9 @@ class TestAWSSecretsManagerIntegration:
         assert auth is None
 
     @patch('boto3.client')
-    def test_aws_caching_behavior(self, mock_client_func):
+    def test_aws_caching_behavior(self, mock_client_func, monkeypatch):
         """Test that AWS secrets are properly cached."""
-        os.environ["MLFLOW_AWS_TTL_SEC"] = "2"
+        monkeypatch.setenv("MLFLOW_AWS_TTL_SEC", "2")
 
         # Mock boto3 client
         mock_client = Mock()
@@ -138,9 +124,8 @@ class TestAWSSecretsManagerIntegration:
         provider.get_auth()
         assert mock_client.get_secret_value.call_count == 1
 
-        # Manually clear cache to simulate expiry
-        from mlflow_secrets_auth.cache import clear_cache
-        clear_cache()
+        # Drop this provider's entry to simulate expiry
+        delete_cache_key(f"{provider.provider_name}:{provider._get_cache_key()}")
 
         # Third call should hit AWS again
         provider.get_auth()
@@ -168,18 +153,10 @@ class TestAWSSecretsManagerIntegration:
         assert auth is not None
 
         # Test that it works as a bearer token
-        request = Mock(spec=requests.PreparedRequest)
-        request.headers = {}
-        request.hooks = {}
+        request = fake_request()
         auth(request)
 
         assert request.headers["Authorization"] == "Bearer invalid-json-content"
 
         # Verify boto3.client was called
         mock_client_func.assert_called_once_with('secretsmanager', region_name='us-west-2')
-
-    def teardown_method(self):
-        """Clean up test environment."""
-        for key in os.environ.copy():
-            if key.startswith(('MLFLOW_', 'AWS_')):
-                del os.environ[key]
@@ -1,79 +1,47 @@
 """Demonstration test showing both retry and auto-refresh functionality working together."""
 
 import json
-import os
 from unittest.mock import Mock, patch
 
+import pytest
 import requests
+from botocore.exceptions import ClientError
 
+from mlflow_secrets_auth.base import _AutoRefreshAuth
 from mlflow_secrets_auth.providers.aws_secrets_manager import AWSSecretsManagerAuthProvider
+from tests._util import fake_request
 
+_SERVICE_UNAVAILABLE = ClientError(
+    {'Error': {'Code': 'ServiceUnavailable', 'Message': 'Service temporarily unavailable'}},
+    'GetSecretValue',
+)
+_ORIGINAL_SECRET = {'SecretString': json.dumps({'token': 'original-token-123'})}
+_REFRESHED_SECRET = {'SecretString': json.dumps({'token': 'refreshed-token-456'})}
+_FETCH_RESULTS = (_SERVICE_UNAVAILABLE, _ORIGINAL_SECRET, _REFRESHED_SECRET)
 
+
+@pytest.mark.usefixtures("aws_env")
 class TestRetryAndAutoRefreshIntegration:
     """Integration test demonstrating retry + auto-refresh working together."""
 
-    def setup_method(self):
-        """Setup test environment."""
-        # Clear environment
-        for key in os.environ.copy():
-            if key.startswith(('MLFLOW_', 'AWS_')):
-                del os.environ[key]
-
-        # Set required environment variables
-        os.environ["MLFLOW_SECRETS_AUTH_ENABLE"] = "aws-secrets-manager"
-        os.environ["AWS_REGION"] = "us-west-2"
-        os.environ["MLFLOW_AWS_SECRET_ID"] = "mlflow-auth-secret"
-
     @patch('boto3.client')
     def test_retry_with_auto_refresh_comprehensive_flow(self, mock_boto_client):
         """Test both retry logic and auto-refresh working together."""
         mock_client = Mock()
         mock_boto_client.return_value = mock_client
 
-        # Track total calls to get_secret_value
-        call_count = 0
-
-        def mock_get_secret_value(*args, **kwargs):
-            nonlocal call_count
-            call_count += 1
-
-            # First call: transient failure, then success
-            if call_count == 1:
-                from botocore.exceptions import ClientError
-                raise ClientError(
-                    {'Error': {'Code': 'ServiceUnavailable', 'Message': 'Service temporarily unavailable'}},
-                    'GetSecretValue',
-                )
-            if call_count == 2:
-                # Retry succeeds with original token
-                return {
-                    'SecretString': json.dumps({
-                        'token': 'original-token-123',
-                    }),
-                }
-            # Auto-refresh fetches new token
-            return {
-                'SecretString': json.dumps({
-                    'token': 'refreshed-token-456',
-                }),
-            }
-
-        mock_client.get_secret_value.side_effect = mock_get_secret_value
+        # Transient failure, then the original token, then the refreshed one
+        mock_client.get_secret_value.side_effect = iter(_FETCH_RESULTS)
 
         # Create provider and get auth
         provider = AWSSecretsManagerAuthProvider()
         auth = provider.get_auth()
 
         # Verify we have an auto-refresh auth wrapper
-        from mlflow_secrets_auth.base import _AutoRefreshAuth
         assert isinstance(auth, _AutoRefreshAuth)
 
         # Create and authenticate a request
-        mock_request = Mock(spec=requests.PreparedRequest)
-        mock_request.headers = {}
-        mock_request.hooks = {}
-        mock_request.copy = Mock(return_value=Mock(spec=requests.PreparedRequest))
-        mock_request.copy.return_value.headers = {}
+        mock_request = fake_request()
 
         authenticated_request = auth(mock_request)
 
@@ -81,8 +49,8 @@ class TestRetryAndAutoRefreshIntegration:
         assert "Authorization" in authenticated_request.headers
         assert authenticated_request.headers["Authorization"] == "Bearer original-token-123"
 
-        # Verify retry happened (call_count should be 2: fail + success)
-        assert call_count == 2
+        # Verify retry happened (call count should be 2: fail + success)
+        assert mock_client.get_secret_value.call_count == 2
 
         # Now simulate a 401 response to trigger auto-refresh
         mock_401_response = Mock(spec=requests.Response)
@@ -104,7 +72,7 @@ class TestRetryAndAutoRefreshIntegration:
         # Verify complete flow:
         # 1. Initial auth with retry: 2 calls (fail -> success)
         # 2. Auto-refresh after 401: 1 more call
-        assert call_count == 3
+        assert mock_client.get_secret_value.call_count == 3
 
         # 3. Retry was sent with fresh credentials
         mock_session.send.assert_called_once()
@@ -114,9 +82,3 @@ class TestRetryAndAutoRefreshIntegration:
 
         # 4. Final response is the successful retry
         assert final_response == mock_retry_response
-
-    def teardown_method(self):
-        """Clean up test environment."""
-        for key in os.environ.copy():
-            if key.startswith(('MLFLOW_', 'AWS_')):
-                del os.environ[key]
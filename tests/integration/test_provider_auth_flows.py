@@ -0,0 +1,121 @@
+"""Bearer and Basic auth flows shared by the Vault and Azure Key Vault providers."""
+
+import base64
+import json
+from collections.abc import Callable
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from unittest.mock import patch
+
+import pytest
+
+from mlflow_secrets_auth.providers.azure_key_vault import AzureKeyVaultAuthProvider
+from mlflow_secrets_auth.providers.vault import VaultAuthProvider
+from tests._util import fake_request
+
+
+def _basic(username, password):
+    """Return the expected Basic ``Authorization`` header value."""
+    return "Basic " + base64.b64encode(f"{username}:{password}".encode()).decode("ascii")
+
+
+def _wire_vault(stack, secret):
+    """Patch hvac and serve ``secret`` from the KV v2 engine."""
+    client = stack.enter_context(patch('hvac.Client')).return_value
+    client.is_authenticated.return_value = True
+    client.secrets.kv.v2.read_secret_version.return_value = {'data': {'data': secret}}
+    return client
+
+
+def _wire_azure(stack, secret):
+    """Patch the Azure SDK and serve ``secret`` as a JSON string."""
+    credential_class = stack.enter_context(patch('azure.identity.DefaultAzureCredential'))
+    secret_client_class = stack.enter_context(patch('azure.keyvault.secrets.SecretClient'))
+    client = secret_client_class.return_value
+    client.get_secret.return_value.value = json.dumps(secret)
+    return client, secret_client_class, credential_class
+
+
+def _verify_vault(mocks):
+    """Check the secret was read from the configured path."""
+    mocks.secrets.kv.v2.read_secret_version.assert_called_once_with(path="mlflow")
+
+
+def _verify_azure(mocks):
+    """Check the Key Vault client was built and queried as configured."""
+    client, secret_client_class, credential_class = mocks
+    secret_client_class.assert_called_once_with(
+        vault_url="https://test-keyvault.vault.azure.net/",
+        credential=credential_class.return_value,
+    )
+    client.get_secret.assert_called_once_with("mlflow-auth-secret")
+
+
+@dataclass(frozen=True)
+class ProviderCase:
+    """One provider/auth-mode combination and its expected header."""
+
+    env_fixture: str
+    wire: Callable
+    get_auth: Callable
+    secret: dict
+    expected_header: str
+    env: dict = field(default_factory=dict)
+    verify: Callable | None = None
+
+
+VAULT_BEARER = ProviderCase(
+    env_fixture="vault_env",
+    wire=_wire_vault,
+    get_auth=lambda: VaultAuthProvider().get_request_auth("https://mlflow.example.com"),
+    secret={'token': 'vault-bearer-token-123'},
+    expected_header="Bearer vault-bearer-token-123",
+    verify=_verify_vault,
+)
+VAULT_BASIC = ProviderCase(
+    env_fixture="vault_env",
+    wire=_wire_vault,
+    get_auth=lambda: VaultAuthProvider().get_request_auth("https://mlflow.example.com"),
+    secret={'username': 'vault-user', 'password': 'vault-pass'},
+    expected_header=_basic('vault-user', 'vault-pass'),
+    env={"MLFLOW_VAULT_AUTH_MODE": "basic"},
+)
+AZURE_BEARER = ProviderCase(
+    env_fixture="azure_env",
+    wire=_wire_azure,
+    get_auth=lambda: AzureKeyVaultAuthProvider().get_auth(),
+    secret={'token': 'azure-bearer-token-123'},
+    expected_header="Bearer azure-bearer-token-123",
+    verify=_verify_azure,
+)
+AZURE_BASIC = ProviderCase(
+    env_fixture="azure_env",
+    wire=_wire_azure,
+    get_auth=lambda: AzureKeyVaultAuthProvider().get_auth(),
+    secret={'username': 'azure-user', 'password': 'azure-pass'},
+    expected_header=_basic('azure-user', 'azure-pass'),
+    env={"MLFLOW_AZURE_AUTH_MODE": "basic"},
+)
+
+
+@pytest.mark.parametrize(
+    'provider_case',
+    [VAULT_BEARER, VAULT_BASIC, AZURE_BEARER, AZURE_BASIC],
+    ids=['vault-bearer', 'vault-basic', 'azure-bearer', 'azure-basic'],
+)
+def test_provider_auth_flow(provider_case, request, monkeypatch):
+    """Test the complete flow from backend secret to Authorization header."""
+    request.getfixturevalue(provider_case.env_fixture)
+    for key, value in provider_case.env.items():
+        monkeypatch.setenv(key, value)
+
+    with ExitStack() as stack:
+        mocks = provider_case.wire(stack, provider_case.secret)
+        auth = provider_case.get_auth()
+
+        prepared = fake_request()
+        auth(prepared)
+
+        assert prepared.headers["Authorization"] == provider_case.expected_header
+        if provider_case.verify is not None:
+            provider_case.verify(mocks)
@@ -1,33 +1,27 @@
 """Unit tests for auto-refresh authentication functionality."""
 
 import json
-import os
-from unittest.mock import Mock
+import threading
+from unittest.mock import Mock, patch
 
 import requests
 
+from mlflow_secrets_auth import base
 from mlflow_secrets_auth.base import (
     _AutoRefreshAuth,
     SecretsBackedAuthProvider,
     BearerAuth,
     BasicAuth,
+    _clone_for_retry,
+    _get_retry_session,
 )
-from mlflow_secrets_auth.cache import delete_cache_key, clear_cache
+from mlflow_secrets_auth.cache import delete_cache_key
+from tests._util import RecordingFake, fake_request, fake_response
 
 
 class TestAutoRefreshAuth:
     """Test _AutoRefreshAuth functionality."""
 
-    def setup_method(self):
-        """Setup test environment."""
-        # Clear cache before each test
-        clear_cache()
-
-        # Clear environment variables
-        for key in os.environ.copy():
-            if key.startswith('MLFLOW_'):
-                del os.environ[key]
-
     def test_successful_request_no_refresh(self):
         """Test that successful requests pass through without refresh."""
         # Create mock auth and provider
@@ -36,10 +30,8 @@ class TestAutoRefreshAuth:
 
         auto_auth = _AutoRefreshAuth(mock_auth, mock_provider, "test:cache:key")
 
-        # Create a mock request with proper hooks dict
-        request = Mock(spec=requests.PreparedRequest)
-        request.headers = {}
-        request.hooks = {}  # Start with empty dict
+        # Create a request with an empty hooks dict
+        request = fake_request()
 
         # Mock the auth to return the request (common pattern)
         mock_auth.return_value = request
@@ -55,9 +47,7 @@ class TestAutoRefreshAuth:
         assert len(result_request.hooks["response"]) == 1
 
         # Test successful response (no refresh should happen)
-        response = Mock(spec=requests.Response)
-        response.status_code = 200
-        response.request = request
+        response = fake_response(200, request)
 
         response_handler = result_request.hooks["response"][0]
         final_response = response_handler(response)
@@ -72,27 +62,21 @@ class TestAutoRefreshAuth:
         mock_auth = Mock(spec=BearerAuth)
         mock_provider = Mock(spec=SecretsBackedAuthProvider)
         mock_provider.logger = Mock()
-        mock_provider._fetch_secret_cached = Mock(return_value={"token": "new-token"})
-        mock_provider._create_auth = Mock()
+        new_secret = {"token": "new-token"}
+        mock_provider._fetch_secret_cached = Mock(return_value=new_secret)
 
         # Create fresh auth for retry
         fresh_auth = Mock(spec=BearerAuth)
-        mock_provider._create_auth.return_value = fresh_auth
+        mock_provider._create_auth = RecordingFake(fresh_auth)
 
         auto_auth = _AutoRefreshAuth(mock_auth, mock_provider, "test:cache:key")
 
         # Create mock 401 response
-        mock_response = Mock(spec=requests.Response)
-        mock_response.status_code = 401
-        mock_response.request = Mock(spec=requests.PreparedRequest)
-        mock_response.request.headers = {}
-        mock_response.request.copy = Mock(return_value=Mock(spec=requests.PreparedRequest))
-        mock_response.request.copy.return_value.headers = {}
+        mock_response = fake_response(401, fake_request())
 
         # Create mock session for retry
         mock_session = Mock(spec=requests.Session)
-        mock_retry_response = Mock(spec=requests.Response)
-        mock_retry_response.status_code = 200
+        mock_retry_response = fake_response(200)
         mock_session.send.return_value = mock_retry_response
 
         # Mock the session access
@@ -106,7 +90,8 @@ class TestAutoRefreshAuth:
         mock_provider._fetch_secret_cached.assert_called_once()
 
         # Verify fresh auth was created
-        mock_provider._create_auth.assert_called_once_with({"token": "new-token"})
+        [(args, _)] = mock_provider._create_auth.calls
+        assert args[0] is new_secret
 
         # Verify request was retried
         mock_session.send.assert_called_once()
@@ -120,24 +105,17 @@ class TestAutoRefreshAuth:
         mock_provider = Mock(spec=SecretsBackedAuthProvider)
         mock_provider.logger = Mock()
         mock_provider._fetch_secret_cached = Mock(return_value={"token": "new-token"})
-        mock_provider._create_auth = Mock()
 
         fresh_auth = Mock(spec=BearerAuth)
-        mock_provider._create_auth.return_value = fresh_auth
+        mock_provider._create_auth = RecordingFake(fresh_auth)
 
         auto_auth = _AutoRefreshAuth(mock_auth, mock_provider, "test:cache:key")
 
         # Create mock 403 response
-        mock_response = Mock(spec=requests.Response)
-        mock_response.status_code = 403
-        mock_response.request = Mock(spec=requests.PreparedRequest)
-        mock_response.request.headers = {}
-        mock_response.request.copy = Mock(return_value=Mock(spec=requests.PreparedRequest))
-        mock_response.request.copy.return_value.headers = {}
+        mock_response = fake_response(403, fake_request())
 
         mock_session = Mock(spec=requests.Session)
-        mock_retry_response = Mock(spec=requests.Response)
-        mock_retry_response.status_code = 200
+        mock_retry_response = fake_response(200)
         mock_session.send.return_value = mock_retry_response
         mock_response.connection = mock_session
 
@@ -145,7 +123,7 @@ class TestAutoRefreshAuth:
 
         # Verify refresh was attempted
         mock_provider._fetch_secret_cached.assert_called_once()
-        mock_provider._create_auth.assert_called_once()
+        assert len(mock_provider._create_auth.calls) == 1
         mock_session.send.assert_called_once()
         assert result == mock_retry_response
 
@@ -158,10 +136,7 @@ class TestAutoRefreshAuth:
         auto_auth = _AutoRefreshAuth(mock_auth, mock_provider, "test:cache:key")
 
         # Create mock 401 response with retry header
-        mock_response = Mock(spec=requests.Response)
-        mock_response.status_code = 401
-        mock_response.request = Mock(spec=requests.PreparedRequest)
-        mock_response.request.headers = {"X-MLFSA-Retried": "true"}
+        mock_response = fake_response(401, fake_request({"X-MLFSA-Retried": "true"}))
 
         result = auto_auth._handle_auth_failure(mock_response)
 
@@ -180,10 +155,7 @@ class TestAutoRefreshAuth:
 
         # Test various non-auth error status codes
         for status_code in [200, 404, 500, 502]:
-            mock_response = Mock(spec=requests.Response)
-            mock_response.status_code = status_code
-            mock_response.request = Mock(spec=requests.PreparedRequest)
-            mock_response.request.headers = {}
+            mock_response = fake_response(status_code, fake_request())
 
             result = auto_auth._handle_auth_failure(mock_response)
 
@@ -202,10 +174,7 @@ class TestAutoRefreshAuth:
 
         auto_auth = _AutoRefreshAuth(mock_auth, mock_provider, "test:cache:key")
 
-        mock_response = Mock(spec=requests.Response)
-        mock_response.status_code = 401
-        mock_response.request = Mock(spec=requests.PreparedRequest)
-        mock_response.request.headers = {}
+        mock_response = fake_response(401, fake_request())
 
         result = auto_auth._handle_auth_failure(mock_response)
 
@@ -224,10 +193,7 @@ class TestAutoRefreshAuth:
 
         auto_auth = _AutoRefreshAuth(mock_auth, mock_provider, "test:cache:key")
 
-        mock_response = Mock(spec=requests.Response)
-        mock_response.status_code = 401
-        mock_response.request = Mock(spec=requests.PreparedRequest)
-        mock_response.request.headers = {}
+        mock_response = fake_response(401, fake_request())
 
         result = auto_auth._handle_auth_failure(mock_response)
 
@@ -244,50 +210,144 @@ class TestAutoRefreshAuth:
         mock_provider.logger = Mock()
         mock_provider._fetch_secret_cached = Mock(return_value={"token": "new-token"})
 
-        fresh_auth = Mock(spec=BearerAuth)
+        fresh_auth = Mock(spec=BearerAuth, side_effect=lambda r: r)
         mock_provider._create_auth = Mock(return_value=fresh_auth)
 
         auto_auth = _AutoRefreshAuth(mock_auth, mock_provider, "test:cache:key")
 
-        mock_response = Mock(spec=requests.Response)
-        mock_response.status_code = 401
-
-        # Create mock request with copy method
-        original_request = Mock(spec=requests.PreparedRequest)
-        original_request.headers = {}
-        retry_request = Mock(spec=requests.PreparedRequest)
-        retry_request.headers = {}
-        original_request.copy = Mock(return_value=retry_request)
-        mock_response.request = original_request
+        original_request = fake_request({"Authorization": "Bearer old-token"})
+        mock_response = fake_response(401, original_request)
 
         mock_session = Mock(spec=requests.Session)
-        mock_retry_response = Mock(spec=requests.Response)
-        mock_retry_response.status_code = 200
+        mock_retry_response = fake_response(200)
         mock_session.send.return_value = mock_retry_response
         mock_response.connection = mock_session
 
         auto_auth._handle_auth_failure(mock_response)
 
-        # Verify retry header was added
+        # Verify retry header was added to the sent clone, not the original
+        retry_request = mock_session.send.call_args[0][0]
         assert retry_request.headers["X-MLFSA-Retried"] == "true"
+        assert "X-MLFSA-Retried" not in original_request.headers
 
         # Verify fresh auth was applied to retry request
         fresh_auth.assert_called_once_with(retry_request)
 
+    def test_retry_clone_shares_body_and_copies_headers(self):
+        """Test that the retry clone reuses the body but not the headers of the original."""
+        original = requests.Request(
+            "POST", "https://mlflow.example.com/api", data=b"payload", headers={"Authorization": "Bearer old"},
+        ).prepare()
+
+        retry = _clone_for_retry(original)
+        retry.headers["Authorization"] = "Bearer new"
+
+        assert retry.body is original.body
+        assert (retry.method, retry.url) == (original.method, original.url)
+        assert retry.headers["Content-Length"] == original.headers["Content-Length"]
+        assert original.headers["Authorization"] == "Bearer old"
+
+    def test_response_connection_used_for_retry(self, monkeypatch):
+        """Test that the adapter that served the failure takes precedence over the shared session."""
+        mock_auth = Mock(spec=BearerAuth)
+        mock_provider = Mock(spec=SecretsBackedAuthProvider)
+        mock_provider.logger = Mock()
+        mock_provider._fetch_secret_cached = Mock(return_value={"token": "new-token"})
+        mock_provider._create_auth = Mock(return_value=Mock(spec=BearerAuth))
+
+        shared_session = Mock(return_value=Mock(spec=requests.Session))
+        monkeypatch.setattr("mlflow_secrets_auth.base._get_retry_session", shared_session)
+
+        auto_auth = _AutoRefreshAuth(mock_auth, mock_provider, "test:cache:key")
+
+        mock_response = fake_response(401, fake_request())
+        mock_response.connection = Mock(spec=requests.Session)
+        mock_retry_response = fake_response(200)
+        mock_response.connection.send.return_value = mock_retry_response
+
+        result = auto_auth._handle_auth_failure(mock_response)
+
+        mock_response.connection.send.assert_called_once()
+        shared_session.assert_not_called()
+        assert result == mock_retry_response
+
+    def test_shared_session_used_without_connection(self):
+        """Test that retries without an originating adapter reuse one pooled session."""
+        mock_auth = Mock(spec=BearerAuth)
+        mock_provider = Mock(spec=SecretsBackedAuthProvider)
+        mock_provider.logger = Mock()
+        mock_provider._fetch_secret_cached = Mock(return_value={"token": "new-token"})
+        mock_provider._create_auth = Mock(return_value=Mock(spec=BearerAuth))
+
+        auto_auth = _AutoRefreshAuth(mock_auth, mock_provider, "test:cache:key")
+
+        mock_response = fake_response(401, fake_request())
+
+        shared_session = Mock(spec=requests.Session)
+        with patch("mlflow_secrets_auth.base._get_retry_session", return_value=shared_session):
+            auto_auth._handle_auth_failure(mock_response)
+
+        shared_session.send.assert_called_once()
+        assert _get_retry_session() is _get_retry_session()
+
+    def test_concurrent_auth_failures_share_one_refresh(self, monkeypatch):
+        """Test that simultaneous 401s trigger a single credential refresh."""
+        followers = threading.Semaphore(0)
+
+        class CountingEvent(threading.Event):
+            def wait(self, timeout=None):
+                followers.release()
+                return super().wait(timeout)
+
+        class CountingFlight(base._RefreshFlight):
+            def __init__(self):
+                super().__init__()
+                self.done = CountingEvent()
+
+        monkeypatch.setattr(base, "_RefreshFlight", CountingFlight)
+
+        responses = [fake_response(401, fake_request()) for _ in range(10)]
+
+        def blocking_fetch():
+            # Hold the refresh open until every other thread is waiting on it
+            for _ in range(len(responses) - 1):
+                assert followers.acquire(timeout=5)
+            return {"token": "new-token"}
+
+        mock_auth = Mock(spec=BearerAuth)
+        mock_provider = Mock(spec=SecretsBackedAuthProvider)
+        mock_provider.logger = Mock()
+        mock_provider._create_auth = Mock(return_value=Mock(spec=BearerAuth))
+        mock_provider._fetch_secret_cached = Mock(side_effect=blocking_fetch)
+
+        mock_session = Mock(spec=requests.Session)
+        mock_retry_response = fake_response(200)
+        mock_session.send.return_value = mock_retry_response
+        for response in responses:
+            response.connection = mock_session
+
+        auto_auth = _AutoRefreshAuth(mock_auth, mock_provider, "test:cache:key")
+        results = []
+
+        def worker(response):
+            results.append(auto_auth._handle_auth_failure(response))
+
+        threads = [threading.Thread(target=worker, args=(r,)) for r in responses]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert mock_provider._fetch_secret_cached.call_count == 1
+        assert results == [mock_retry_response] * len(responses)
+
 
 class TestSecretsBackedAuthProviderAutoRefresh:
     """Test auto-refresh integration in SecretsBackedAuthProvider."""
 
-    def setup_method(self):
-        """Setup test environment."""
-        clear_cache()
-        for key in os.environ.copy():
-            if key.startswith('MLFLOW_'):
-                del os.environ[key]
-
-    def test_create_auth_wraps_with_auto_refresh(self):
+    def test_create_auth_wraps_with_auto_refresh(self, monkeypatch):
         """Test that _create_auth wraps auth objects with auto-refresh."""
-        os.environ["MLFLOW_SECRETS_AUTH_ENABLE"] = "test"
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE", "test")
 
         # Create a test provider
         class TestProvider(SecretsBackedAuthProvider):
@@ -314,9 +374,9 @@ class TestSecretsBackedAuthProviderAutoRefresh:
         assert auth.provider == provider
         assert auth.cache_key == "test:test-key"
 
-    def test_integration_with_get_auth(self):
+    def test_integration_with_get_auth(self, monkeypatch):
         """Test integration of auto-refresh with get_auth method."""
-        os.environ["MLFLOW_SECRETS_AUTH_ENABLE"] = "test"
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE", "test")
 
         class TestProvider(SecretsBackedAuthProvider):
             def _fetch_secret(self):
@@ -338,21 +398,31 @@ class TestSecretsBackedAuthProviderAutoRefresh:
         assert isinstance(auth, _AutoRefreshAuth)
         assert isinstance(auth.auth, BasicAuth)
 
-    def teardown_method(self):
-        """Clean up test environment."""
-        clear_cache()
-        for key in os.environ.copy():
-            if key.startswith('MLFLOW_'):
-                del os.environ[key]
+    def test_create_auth_unwrapped_when_auto_refresh_disabled(self, monkeypatch):
+        """Test that MLFLOW_SECRETS_AUTOREFRESH=0 returns the bare auth object."""
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTOREFRESH", "0")
+
+        class TestProvider(SecretsBackedAuthProvider):
+            def _fetch_secret(self):
+                return json.dumps({"token": "test-token"})
+
+            def _get_cache_key(self):
+                return "test-key"
+
+            def _get_auth_mode(self):
+                return "bearer"
+
+            def _get_ttl(self):
+                return 300
+
+        auth = TestProvider("test", 300)._create_auth({"token": "test-token"})
+
+        assert type(auth) is BearerAuth
 
 
 class TestCacheKeyDeletion:
     """Test cache key deletion functionality."""
 
-    def setup_method(self):
-        """Setup test environment."""
-        clear_cache()
-
     def test_delete_existing_cache_key(self):
         """Test deleting an existing cache key."""
         from mlflow_secrets_auth.cache import _global_cache
@@ -369,7 +439,3 @@ class TestCacheKeyDeletion:
         """Test deleting a non-existent cache key doesn't raise error."""
         # Should not raise any exception
         delete_cache_key("nonexistent:key")
-
-    def teardown_method(self):
-        """Clean up test environment."""
-        clear_cache()
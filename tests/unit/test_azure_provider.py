@@ -1,25 +1,21 @@
 """Unit tests for Azure Key Vault provider."""
 
-import os
 from unittest.mock import patch
 
+import pytest
+
 from mlflow_secrets_auth.providers.azure_key_vault import AzureKeyVaultAuthProvider
 
 
 class TestAzureKeyVaultProvider:
     """Test Azure Key Vault provider."""
 
-    def setup_method(self):
-        """Setup test environment."""
-        # Clear any existing environment variables
-        for key in os.environ.copy():
-            if key.startswith(('MLFLOW_', 'AZURE_')):
-                del os.environ[key]
-
-        # Set required environment variables
-        os.environ["MLFLOW_SECRETS_AUTH_ENABLE"] = "azure-key-vault"
-        os.environ["AZURE_KEY_VAULT_URL"] = "https://test.vault.azure.net/"
-        os.environ["MLFLOW_AZURE_SECRET_NAME"] = "test-secret"
+    @pytest.fixture(autouse=True)
+    def _env(self, monkeypatch):
+        """Set the environment required by every test in the class."""
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE", "azure-key-vault")
+        monkeypatch.setenv("AZURE_KEY_VAULT_URL", "https://test.vault.azure.net/")
+        monkeypatch.setenv("MLFLOW_AZURE_SECRET_NAME", "test-secret")
 
     @patch('azure.identity.DefaultAzureCredential')
     @patch('azure.keyvault.secrets.SecretClient')
@@ -30,17 +26,17 @@ class TestAzureKeyVaultProvider:
 
     @patch('azure.identity.DefaultAzureCredential')
     @patch('azure.keyvault.secrets.SecretClient')
-    def test_provider_disabled(self, mock_secret_client, mock_credential):
+    def test_provider_disabled(self, mock_secret_client, mock_credential, monkeypatch):
         """Test that disabled provider returns None."""
-        del os.environ["MLFLOW_SECRETS_AUTH_ENABLE"]
+        monkeypatch.delenv("MLFLOW_SECRETS_AUTH_ENABLE")
 
         provider = AzureKeyVaultAuthProvider()
         auth = provider.get_auth()
         assert auth is None
 
-    def test_missing_vault_url(self):
+    def test_missing_vault_url(self, monkeypatch):
         """Test behavior when vault URL is not configured."""
-        del os.environ["AZURE_KEY_VAULT_URL"]
+        monkeypatch.delenv("AZURE_KEY_VAULT_URL")
 
         provider = AzureKeyVaultAuthProvider()
 
@@ -50,9 +46,9 @@ class TestAzureKeyVaultProvider:
 
     @patch('azure.identity.DefaultAzureCredential')
     @patch('azure.keyvault.secrets.SecretClient')
-    def test_missing_secret_name(self, mock_secret_client, mock_credential):
+    def test_missing_secret_name(self, mock_secret_client, mock_credential, monkeypatch):
         """Test behavior when secret name is not configured."""
-        del os.environ["MLFLOW_AZURE_SECRET_NAME"]
+        monkeypatch.delenv("MLFLOW_AZURE_SECRET_NAME")
 
         provider = AzureKeyVaultAuthProvider()
 
@@ -62,24 +58,18 @@ class TestAzureKeyVaultProvider:
 
     @patch('azure.identity.DefaultAzureCredential')
     @patch('azure.keyvault.secrets.SecretClient')
-    def test_custom_ttl(self, mock_secret_client, mock_credential):
+    def test_custom_ttl(self, mock_secret_client, mock_credential, monkeypatch):
         """Test custom TTL configuration."""
-        os.environ["MLFLOW_AZURE_TTL_SEC"] = "600"
+        monkeypatch.setenv("MLFLOW_AZURE_TTL_SEC", "600")
 
         provider = AzureKeyVaultAuthProvider()
         assert provider._get_ttl() == 600
 
     @patch('azure.identity.DefaultAzureCredential')
     @patch('azure.keyvault.secrets.SecretClient')
-    def test_custom_auth_mode(self, mock_secret_client, mock_credential):
+    def test_custom_auth_mode(self, mock_secret_client, mock_credential, monkeypatch):
         """Test custom auth mode configuration."""
-        os.environ["MLFLOW_AZURE_AUTH_MODE"] = "basic"
+        monkeypatch.setenv("MLFLOW_AZURE_AUTH_MODE", "basic")
 
         provider = AzureKeyVaultAuthProvider()
         assert provider._get_auth_mode() == "basic"
-
-    def teardown_method(self):
-        """Clean up test environment."""
-        for key in os.environ.copy():
-            if key.startswith(('MLFLOW_', 'AZURE_')):
-                del os.environ[key]
@@ -3,11 +3,13 @@
 import base64
 import os
 import time
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
+import pytest
 import requests
 
 from mlflow_secrets_auth.base import SecretsBackedAuthProvider
+from mlflow_secrets_auth.utils import parse_secret_json
 
 
 class MockAuthProvider(SecretsBackedAuthProvider):
@@ -38,18 +40,14 @@ class MockAuthProvider(SecretsBackedAuthProvider):
 class TestSecretsBackedAuthProvider:
     """Test the base auth provider functionality."""
 
-    def setup_method(self):
-        """Setup test environment."""
-        # Clear any existing environment variables
-        for key in os.environ.copy():
-            if key.startswith('MLFLOW_'):
-                del os.environ[key]
-
+    @pytest.fixture(autouse=True)
+    def _provider(self):
+        """Create a fresh provider for each test."""
         self.provider = MockAuthProvider()
 
-    def test_bearer_token_auth(self):
+    def test_bearer_token_auth(self, monkeypatch):
         """Test bearer token authentication."""
-        os.environ["MLFLOW_SECRETS_AUTH_ENABLE"] = "test"
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE", "test")
         self.provider.set_test_secret({"token": "test-bearer-token"})
 
         auth = self.provider.get_auth()
@@ -62,10 +60,10 @@ class TestSecretsBackedAuthProvider:
 
         assert request.headers["Authorization"] == "Bearer test-bearer-token"
 
-    def test_basic_auth(self):
+    def test_basic_auth(self, monkeypatch):
         """Test basic authentication."""
-        os.environ["MLFLOW_SECRETS_AUTH_ENABLE"] = "test"
-        os.environ["MLFLOW_TEST_AUTH_MODE"] = "basic"
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE", "test")
+        monkeypatch.setenv("MLFLOW_TEST_AUTH_MODE", "basic")
         self.provider = MockAuthProvider()
         self.provider.set_test_secret({
             "username": "testuser",
@@ -85,10 +83,10 @@ class TestSecretsBackedAuthProvider:
         expected = base64.b64encode(b"testuser:testpass").decode('utf-8')
         assert request.headers["Authorization"] == f"Basic {expected}"
 
-    def test_custom_header_name(self):
+    def test_custom_header_name(self, monkeypatch):
         """Test custom authentication header name."""
-        os.environ["MLFLOW_SECRETS_AUTH_ENABLE"] = "test"
-        os.environ["MLFLOW_AUTH_HEADER_NAME"] = "X-Custom-Auth"
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE", "test")
+        monkeypatch.setenv("MLFLOW_AUTH_HEADER_NAME", "X-Custom-Auth")
         self.provider = MockAuthProvider()
         self.provider.set_test_secret({"token": "custom-token"})
 
@@ -102,10 +100,10 @@ class TestSecretsBackedAuthProvider:
         assert request.headers["X-Custom-Auth"] == "custom-token"
         assert "Authorization" not in request.headers
 
-    def test_host_allowlist(self):
+    def test_host_allowlist(self, monkeypatch):
         """Test host allowlist functionality."""
-        os.environ["MLFLOW_SECRETS_AUTH_ENABLE"] = "test"
-        os.environ["MLFLOW_SECRETS_ALLOWED_HOSTS"] = "mlflow.example.com,trusted.example.com"
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE", "test")
+        monkeypatch.setenv("MLFLOW_SECRETS_ALLOWED_HOSTS", "mlflow.example.com,trusted.example.com")
         self.provider = MockAuthProvider()
 
         # Allowed host should get auth
@@ -116,11 +114,11 @@ class TestSecretsBackedAuthProvider:
         auth = self.provider.get_request_auth("https://untrusted.example.com/api/2.0/")
         assert auth is None
 
-    def test_caching(self):
+    def test_caching(self, monkeypatch):
         """Test secret caching functionality."""
         # Use short TTL for testing
-        os.environ["MLFLOW_SECRETS_AUTH_ENABLE"] = "test"
-        os.environ["MLFLOW_TEST_TTL_SEC"] = "1"
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE", "test")
+        monkeypatch.setenv("MLFLOW_TEST_TTL_SEC", "1")
 
         self.provider = MockAuthProvider()
         call_count = 0
@@ -148,9 +146,19 @@ class TestSecretsBackedAuthProvider:
         self.provider.get_auth()
         assert call_count == 2
 
-    def test_invalid_secret_format(self):
+    def test_cached_secret_is_not_reparsed(self, monkeypatch):
+        """Test that warm-cache calls reuse the parsed secret instead of re-parsing JSON."""
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE", "test")
+
+        with patch("mlflow_secrets_auth.base.parse_secret_json", wraps=parse_secret_json) as mock_parse:
+            for _ in range(3):
+                assert self.provider.get_auth() is not None
+
+        mock_parse.assert_called_once()
+
+    def test_invalid_secret_format(self, monkeypatch):
         """Test handling of invalid secret format."""
-        os.environ["MLFLOW_SECRETS_AUTH_ENABLE"] = "test"
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE", "test")
         self.provider = MockAuthProvider()
         self.provider.set_test_secret({"invalid": "format"})
 
@@ -158,9 +166,9 @@ class TestSecretsBackedAuthProvider:
         auth = self.provider.get_auth()
         assert auth is None
 
-    def test_backend_error_handling(self):
+    def test_backend_error_handling(self, monkeypatch):
         """Test error handling when backend fails."""
-        os.environ["MLFLOW_SECRETS_AUTH_ENABLE"] = "test"
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE", "test")
         self.provider = MockAuthProvider()
 
         def failing_fetch():
@@ -175,12 +183,84 @@ class TestSecretsBackedAuthProvider:
 
     def test_disabled_provider(self):
         """Test that disabled provider returns None."""
+        self.provider._fetch_secret = Mock()
+
         # Don't set the enable flag
         auth = self.provider.get_auth()
         assert auth is None
-
-    def teardown_method(self):
-        """Clean up test environment."""
-        for key in os.environ.copy():
-            if key.startswith('MLFLOW_'):
-                del os.environ[key]
+        assert self.provider.get_request_auth("https://mlflow.example.com") is None
+        self.provider._fetch_secret.assert_not_called()
+
+    def test_enablement_rechecked_when_flag_changes(self, monkeypatch):
+        """Test that the cached enablement verdict follows the enable flags."""
+        assert self.provider.get_auth() is None
+
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE_TEST", "true")
+        assert self.provider.get_auth() is not None
+
+        monkeypatch.delenv("MLFLOW_SECRETS_AUTH_ENABLE_TEST")
+        assert self.provider.get_auth() is None
+
+    def test_host_allowlist_exact_and_wildcard(self, monkeypatch):
+        """Test that exact entries and wildcard patterns are both honoured."""
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE", "test")
+        monkeypatch.setenv("MLFLOW_SECRETS_ALLOWED_HOSTS", "MLflow.Example.com,*.corp.example.com")
+
+        assert self.provider.get_request_auth("https://mlflow.example.com/api") is not None
+        assert self.provider.get_request_auth("https://api.corp.example.com/api") is not None
+        assert self.provider.get_request_auth("https://other.example.com/api") is None
+
+    def test_host_allowlist_follows_env_changes(self, monkeypatch):
+        """Test that the compiled allowlist is rebuilt when the env var changes."""
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE", "test")
+        monkeypatch.setenv("MLFLOW_SECRETS_ALLOWED_HOSTS", "a.example.com")
+        assert self.provider.get_request_auth("https://b.example.com") is None
+
+        monkeypatch.setenv("MLFLOW_SECRETS_ALLOWED_HOSTS", "b.example.com")
+        assert self.provider.get_request_auth("https://b.example.com") is not None
+
+        monkeypatch.delenv("MLFLOW_SECRETS_ALLOWED_HOSTS")
+        assert self.provider.get_request_auth("https://c.example.com") is not None
+
+    def test_config_memoized_until_env_changes(self, monkeypatch):
+        """Test that declared config env vars gate re-resolving mode, TTL and cache key."""
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE", "test")
+        monkeypatch.setattr(MockAuthProvider, "_config_env_vars", ("MLFLOW_TEST_AUTH_MODE", "MLFLOW_TEST_TTL_SEC"))
+        provider = MockAuthProvider()
+
+        with patch.object(provider, "_get_auth_mode", wraps=provider._get_auth_mode) as mock_mode:
+            for _ in range(3):
+                assert provider.get_auth() is not None
+            assert mock_mode.call_count == 1
+
+            monkeypatch.setenv("MLFLOW_TEST_TTL_SEC", "600")
+            provider.get_auth()
+            assert mock_mode.call_count == 2
+
+        # The provider-prefixed cache key is built once, not per call
+        cache_key = provider._resolved_config()[0]
+        assert cache_key == "test:test_provider_cache"
+        assert provider._resolved_config()[0] is cache_key
+
+    def test_config_resolved_once_per_request(self, monkeypatch):
+        """Test that fetching and building auth share one config resolution."""
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE", "test")
+
+        with patch.object(self.provider, "_resolved_config", wraps=self.provider._resolved_config) as mock_config:
+            assert self.provider.get_request_auth("https://mlflow.example.com") is not None
+            assert self.provider.get_auth() is not None
+        assert mock_config.call_count == 2
+
+    def test_mismatched_secret_skips_auth_construction(self, monkeypatch):
+        """Test that a secret unusable in the configured mode is rejected before building auth."""
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE", "test")
+        monkeypatch.setenv("MLFLOW_TEST_AUTH_MODE", "basic")
+        self.provider.set_test_secret({"token": "no-colon-token"})
+
+        with patch.object(self.provider, "_build_auth") as mock_build:
+            assert self.provider.get_auth() is None
+            assert self.provider.get_request_auth("https://mlflow.example.com") is None
+        mock_build.assert_not_called()
+
+        with pytest.raises(ValueError, match="username:password"):
+            self.provider._create_auth({"token": "no-colon-token"})
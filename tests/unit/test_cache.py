@@ -1,10 +1,12 @@
 """Unit tests for caching functionality."""
 
 import time
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from mlflow_secrets_auth.cache import TTLCache
 
+NS = 1_000_000_000
+
 
 class TestTTLCache:
     """Test TTL cache functionality."""
@@ -69,7 +71,7 @@ class TestTTLCache:
         cache.clear()
         assert cache.size() == 0
 
-    @patch('mlflow_secrets_auth.cache.time.monotonic')
+    @patch('mlflow_secrets_auth.cache.time.monotonic_ns')
     def test_cache_expiry_with_mock_time(self, mock_time):
         """Test cache expiry using mocked monotonic time."""
         # Start at time 0
@@ -79,9 +81,53 @@ class TestTTLCache:
         cache.set("key1", "value1", 300)
 
         # Move forward 200 seconds (within TTL)
-        mock_time.return_value = 200
+        mock_time.return_value = 200 * NS
         assert cache.get("key1") == "value1"
 
         # Move forward 400 seconds (beyond TTL)
-        mock_time.return_value = 400
+        mock_time.return_value = 400 * NS
+        assert cache.get("key1") is None
+
+    @patch('mlflow_secrets_auth.cache.time.monotonic_ns')
+    def test_cache_prunes_many_keys_by_expiry(self, mock_time):
+        """Test that only expired entries are pruned across a large key set."""
+        mock_time.return_value = 0
+
+        cache = TTLCache()
+        for i in range(10_000):
+            # Half the keys expire after 100s, the rest after 300s
+            cache.set(f"key{i}", i, 100 if i % 2 else 300)
+        assert cache.size() == 10_000
+
+        mock_time.return_value = 200 * NS
+        assert cache.size() == 5_000
+        assert cache.get("key0") == 0
         assert cache.get("key1") is None
+
+        mock_time.return_value = 400 * NS
+        assert cache.size() == 0
+
+    @patch('mlflow_secrets_auth.cache.time.monotonic_ns')
+    def test_cache_overwrite_keeps_latest_expiry(self, mock_time):
+        """Test that overwriting a key is not undone by its earlier expiry."""
+        mock_time.return_value = 0
+
+        cache = TTLCache()
+        cache.set("key1", "old", 100)
+        for _ in range(1_000):
+            cache.set("key1", "new", 300)
+
+        mock_time.return_value = 200 * NS
+        assert cache.size() == 1
+        assert cache.get("key1") == "new"
+
+    def test_cache_get_does_not_take_lock(self):
+        """Test that reads of live entries bypass the write lock."""
+        cache = TTLCache()
+        cache.set("key1", "value1", 60)
+
+        cache._lock = MagicMock()
+        cache._lock.__enter__.side_effect = AssertionError("read path took the lock")
+
+        assert cache.get("key1") == "value1"
+        assert cache.get("missing") is None
@@ -1,35 +1,29 @@
 """Unit tests for configuration utilities."""
 
-import os
-
 from mlflow_secrets_auth.config import (
     get_env_var,
     get_auth_header_name,
     get_allowed_hosts,
     is_provider_enabled,
+    provider_enable_env_key,
+    _parse_allowed_hosts,
+    _parse_enabled_providers,
 )
 
 
 class TestConfig:
     """Test configuration utilities."""
 
-    def setup_method(self):
-        """Setup test environment."""
-        # Clear any existing environment variables
-        for key in os.environ.copy():
-            if key.startswith('MLFLOW_'):
-                del os.environ[key]
-
-    def test_get_env_var_with_provider_prefix(self):
+    def test_get_env_var_with_provider_prefix(self, monkeypatch):
         """Test getting environment variable with provider prefix."""
-        os.environ["MLFLOW_VAULT_SECRET_PATH"] = "/secret/path"
+        monkeypatch.setenv("MLFLOW_VAULT_SECRET_PATH", "/secret/path")
 
         result = get_env_var("MLFLOW_VAULT_SECRET_PATH")
         assert result == "/secret/path"
 
-    def test_get_env_var_without_provider_prefix(self):
+    def test_get_env_var_without_provider_prefix(self, monkeypatch):
         """Test getting environment variable without provider prefix."""
-        os.environ["MLFLOW_AUTH_HEADER_NAME"] = "X-Custom-Auth"
+        monkeypatch.setenv("MLFLOW_AUTH_HEADER_NAME", "X-Custom-Auth")
 
         result = get_env_var("MLFLOW_AUTH_HEADER_NAME")
         assert result == "X-Custom-Auth"
@@ -49,9 +43,9 @@ class TestConfig:
         result = get_auth_header_name()
         assert result == "Authorization"
 
-    def test_get_auth_header_name_custom(self):
+    def test_get_auth_header_name_custom(self, monkeypatch):
         """Test custom auth header name."""
-        os.environ["MLFLOW_AUTH_HEADER_NAME"] = "X-API-Key"
+        monkeypatch.setenv("MLFLOW_AUTH_HEADER_NAME", "X-API-Key")
         result = get_auth_header_name()
         assert result == "X-API-Key"
 
@@ -60,27 +54,38 @@ class TestConfig:
         result = get_allowed_hosts()
         assert result is None
 
-    def test_get_allowed_hosts_single(self):
+    def test_get_allowed_hosts_single(self, monkeypatch):
         """Test single allowed host."""
-        os.environ["MLFLOW_SECRETS_ALLOWED_HOSTS"] = "mlflow.example.com"
+        monkeypatch.setenv("MLFLOW_SECRETS_ALLOWED_HOSTS", "mlflow.example.com")
         result = get_allowed_hosts()
         assert result == ["mlflow.example.com"]
 
-    def test_get_allowed_hosts_multiple(self):
+    def test_get_allowed_hosts_multiple(self, monkeypatch):
         """Test multiple allowed hosts."""
-        os.environ["MLFLOW_SECRETS_ALLOWED_HOSTS"] = "host1.com,host2.com,host3.com"
+        monkeypatch.setenv("MLFLOW_SECRETS_ALLOWED_HOSTS", "host1.com,host2.com,host3.com")
         result = get_allowed_hosts()
         assert result == ["host1.com", "host2.com", "host3.com"]
 
-    def test_get_allowed_hosts_with_spaces(self):
+    def test_get_allowed_hosts_with_spaces(self, monkeypatch):
         """Test allowed hosts with spaces."""
-        os.environ["MLFLOW_SECRETS_ALLOWED_HOSTS"] = " host1.com , host2.com , host3.com "
+        monkeypatch.setenv("MLFLOW_SECRETS_ALLOWED_HOSTS", " host1.com , host2.com , host3.com ")
         result = get_allowed_hosts()
         assert result == ["host1.com", "host2.com", "host3.com"]
 
-    def test_is_provider_enabled_true(self):
+    def test_get_allowed_hosts_parsed_once_per_value(self, monkeypatch):
+        """Test that parsing is cached per raw value without sharing the returned list."""
+        monkeypatch.setenv("MLFLOW_SECRETS_ALLOWED_HOSTS", "host1.com, host2.com")
+        _parse_allowed_hosts.cache_clear()
+
+        first = get_allowed_hosts()
+        first.append("evil.com")
+
+        assert get_allowed_hosts() == ["host1.com", "host2.com"]
+        assert _parse_allowed_hosts.cache_info().hits == 1
+
+    def test_is_provider_enabled_true(self, monkeypatch):
         """Test when provider is enabled."""
-        os.environ["MLFLOW_SECRETS_AUTH_ENABLE"] = "vault"
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE", "vault")
         assert is_provider_enabled("vault") is True
         assert is_provider_enabled("aws-secrets-manager") is False
 
@@ -89,8 +94,20 @@ class TestConfig:
         assert is_provider_enabled("vault") is False
         assert is_provider_enabled("aws-secrets-manager") is False
 
-    def teardown_method(self):
-        """Clean up test environment."""
-        for key in os.environ.copy():
-            if key.startswith('MLFLOW_'):
-                del os.environ[key]
+    def test_is_provider_enabled_per_provider_flag(self, monkeypatch):
+        """Test the per-provider enable variable and its name."""
+        env_key = provider_enable_env_key("aws-secrets-manager")
+        assert env_key == "MLFLOW_SECRETS_AUTH_ENABLE_AWS_SECRETS_MANAGER"
+
+        monkeypatch.setenv(env_key, "true")
+        assert is_provider_enabled("aws-secrets-manager") is True
+
+    def test_is_provider_enabled_parses_list_once(self, monkeypatch):
+        """Test that the global enable list is parsed once per raw value."""
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE", " Vault , azure-key-vault ")
+        _parse_enabled_providers.cache_clear()
+
+        assert is_provider_enabled("vault") is True
+        assert is_provider_enabled("azure-key-vault") is True
+        assert is_provider_enabled("aws-secrets-manager") is False
+        assert _parse_enabled_providers.cache_info().misses == 1
@@ -1,67 +1,13 @@
 """Unit tests for SecretsAuthProviderFactory and version export."""
 
 import importlib.metadata
-from unittest.mock import Mock, patch
+from collections import Counter
 
-from mlflow_secrets_auth import SecretsAuthProviderFactory
-from mlflow_secrets_auth.base import SecretsBackedAuthProvider
-
-
-class TestVersionExport:
-    """Test version export functionality."""
-
-    def test_version_export_success(self):
-        """Test successful version export from importlib.metadata."""
-        expected_version = "1.2.3"
-
-        with patch('importlib.metadata.version', return_value=expected_version):
-            # Re-import the module to trigger version resolution
-            import importlib
-            import mlflow_secrets_auth
-            importlib.reload(mlflow_secrets_auth)
-
-            assert mlflow_secrets_auth.__version__ == expected_version
+import pytest
 
-    def test_version_export_fallback_local(self):
-        """Test fallback version when PackageNotFoundError is raised."""
-        with patch('importlib.metadata.version', side_effect=importlib.metadata.PackageNotFoundError("package not found")):
-            # Re-import the module to trigger version resolution
-            import importlib as imp
-            import mlflow_secrets_auth
-            imp.reload(mlflow_secrets_auth)
-
-            assert mlflow_secrets_auth.__version__ == "0.0.0+local"
-
-
-class TestFactoryEnablement:
-    """Test factory enablement logic."""
-
-    def test_is_enabled_false_when_no_providers_enabled(self):
-        """Test _is_enabled returns False when no providers are enabled."""
-        factory = SecretsAuthProviderFactory()
-
-        with patch('mlflow_secrets_auth.is_provider_enabled', return_value=False):
-            assert factory._is_enabled() is False
-
-    def test_is_enabled_true_when_any_provider_enabled(self):
-        """Test _is_enabled returns True when at least one provider is enabled."""
-        factory = SecretsAuthProviderFactory()
-
-        def is_enabled_side_effect(name):
-            return name == "vault"  # Only vault enabled
-
-        with patch('mlflow_secrets_auth.is_provider_enabled', side_effect=is_enabled_side_effect):
-            assert factory._is_enabled() is True
-
-    def test_is_enabled_true_when_multiple_providers_enabled(self):
-        """Test _is_enabled returns True when multiple providers are enabled."""
-        factory = SecretsAuthProviderFactory()
-
-        def is_enabled_side_effect(name):
-            return name in ["vault", "aws-secrets-manager"]
-
-        with patch('mlflow_secrets_auth.is_provider_enabled', side_effect=is_enabled_side_effect):
-            assert factory._is_enabled() is True
+import mlflow_secrets_auth
+from mlflow_secrets_auth import SecretsAuthProviderFactory, _resolve_version
+from mlflow_secrets_auth.base import SecretsBackedAuthProvider
 
 
 class MockProvider(SecretsBackedAuthProvider):
@@ -95,308 +41,386 @@ class FailingMockProvider(MockProvider):
         raise Exception(msg)
 
 
-class TestProviderResolution:
-    """Test provider resolution and caching."""
+class _CountingProvider(MockProvider):
+    """Vault-named provider that counts config hook calls."""
 
-    def test_get_actual_provider_picks_first_enabled_and_caches_instance(self):
-        """Test that the factory picks the first enabled provider and caches the instance."""
-        factory = SecretsAuthProviderFactory()
+    _config_env_vars = ("MLFLOW_VAULT_TTL_SEC",)
 
-        # Create mock providers
-        mock_vault = MockProvider("vault")
-        mock_aws = MockProvider("aws")
+    def __init__(self):
+        super().__init__("vault")
+        self.calls = Counter()
 
-        mock_providers = {
-            "vault": lambda: mock_vault,
-            "aws-secrets-manager": lambda: mock_aws,
-            "azure-key-vault": lambda: MockProvider("azure"),
-        }
+    def _get_cache_key(self) -> str:
+        self.calls["cache_key"] += 1
+        return super()._get_cache_key()
+
+    def _get_auth_mode(self) -> str:
+        self.calls["auth_mode"] += 1
+        return "bearer"
+
+    def _get_ttl(self) -> int:
+        self.calls["ttl"] += 1
+        return super()._get_ttl()
+
+
+class _ExplodingProvider:
+    """Provider whose delegated methods all raise."""
+
+    def _fetch_secret(self):
+        msg = "Fetch error"
+        raise RuntimeError(msg)
+
+    def _get_cache_key(self):
+        msg = "Cache error"
+        raise RuntimeError(msg)
+
+    def _get_auth_mode(self):
+        msg = "Auth error"
+        raise RuntimeError(msg)
+
+    def _get_ttl(self):
+        msg = "TTL error"
+        raise RuntimeError(msg)
+
+
+@pytest.fixture(scope="module")
+def vault_provider():
+    """Vault-named MockProvider shared by the tests in this module."""
+    return MockProvider("vault")
+
+
+@pytest.fixture(scope="module")
+def aws_provider():
+    """AWS-named MockProvider shared by the tests in this module."""
+    return MockProvider("aws")
+
+
+@pytest.fixture(scope="module")
+def azure_provider():
+    """Azure-named MockProvider shared by the tests in this module."""
+    return MockProvider("azure")
+
+
+@pytest.fixture(scope="module")
+def readonly_factory():
+    """Factory shared by tests that never resolve or mutate it."""
+    return SecretsAuthProviderFactory()
+
+
+@pytest.fixture
+def factory():
+    """Fresh factory per test; resolution caches the chosen provider on it."""
+    return SecretsAuthProviderFactory()
+
+
+# Registry subsets a test can request via indirect parametrization of mock_providers
+_REGISTRY_VARIANTS = {
+    "vault_only": ("vault",),
+    "vault_and_aws": ("vault", "aws-secrets-manager"),
+    "all": ("vault", "aws-secrets-manager", "azure-key-vault"),
+}
+
+
+@pytest.fixture(scope="module")
+def all_providers(vault_provider, aws_provider, azure_provider):
+    """Full provider registry in priority order, built once per module."""
+    return {
+        "vault": lambda: vault_provider,
+        "aws-secrets-manager": lambda: aws_provider,
+        "azure-key-vault": lambda: azure_provider,
+    }
+
+
+@pytest.fixture
+def mock_providers(request, all_providers):
+    """Per-test copy of the shared registry, safe for tests to modify.
+
+    Defaults to all three providers; parametrize indirectly with a
+    ``_REGISTRY_VARIANTS`` key to get a smaller registry.
+    """
+    names = _REGISTRY_VARIANTS[getattr(request, "param", "all")]
+    return {name: all_providers[name] for name in names}
 
+
+class TestVersionExport:
+    """Test version export functionality."""
+
+    def test_version_export_success(self, monkeypatch):
+        """Test successful version export from importlib.metadata."""
+        monkeypatch.setattr(importlib.metadata, "version", lambda _: "1.2.3")
+
+        assert _resolve_version() == "1.2.3"
+
+    def test_version_export_fallback_local(self, monkeypatch):
+        """Test fallback version when PackageNotFoundError is raised."""
+        def version(_):
+            raise importlib.metadata.PackageNotFoundError("package not found")
+
+        monkeypatch.setattr(importlib.metadata, "version", version)
+
+        assert _resolve_version() == "0.0.0+local"
+
+    def test_version_resolved_lazily_and_cached(self, monkeypatch):
+        """Test __version__ is looked up on first access only."""
+        mlflow_secrets_auth.__version__  # noqa: B018 - ensure monkeypatch restores a real value
+        monkeypatch.delitem(vars(mlflow_secrets_auth), "__version__")
+        lookups = []
+        monkeypatch.setattr(importlib.metadata, "version", lambda name: lookups.append(name) or "1.2.3")
+
+        assert mlflow_secrets_auth.__version__ == "1.2.3"
+        assert mlflow_secrets_auth.__version__ == "1.2.3"
+        assert len(lookups) == 1
+
+
+class TestFactoryEnablement:
+    """Test factory enablement logic."""
+
+    def test_is_enabled_false_when_no_providers_enabled(self, readonly_factory, monkeypatch):
+        """Test _is_enabled returns False when no providers are enabled."""
+        monkeypatch.setattr(mlflow_secrets_auth, "is_provider_enabled", lambda _name: False)
+        assert readonly_factory._is_enabled() is False
+
+    def test_is_enabled_true_when_any_provider_enabled(self, readonly_factory, monkeypatch):
+        """Test _is_enabled returns True when at least one provider is enabled."""
         def is_enabled_side_effect(name):
-            return name in ["vault", "aws-secrets-manager"]  # Both enabled
+            return name == "vault"  # Only vault enabled
 
-        with patch('mlflow_secrets_auth.is_provider_enabled', side_effect=is_enabled_side_effect), \
-             patch.object(factory, '_PROVIDERS', mock_providers):
+        monkeypatch.setattr(mlflow_secrets_auth, "is_provider_enabled", is_enabled_side_effect)
+        assert readonly_factory._is_enabled() is True
 
-            # First call should return vault (first in order)
-            provider1 = factory._get_actual_provider()
-            assert provider1 is mock_vault
-            assert provider1.name == "vault"
+    def test_is_enabled_true_when_multiple_providers_enabled(self, readonly_factory, monkeypatch):
+        """Test _is_enabled returns True when multiple providers are enabled."""
+        def is_enabled_side_effect(name):
+            return name in ["vault", "aws-secrets-manager"]
 
-            # Second call should return the same cached instance
-            provider2 = factory._get_actual_provider()
-            assert provider2 is provider1  # Same object, cached
+        monkeypatch.setattr(mlflow_secrets_auth, "is_provider_enabled", is_enabled_side_effect)
+        assert readonly_factory._is_enabled() is True
 
-    def test_get_actual_provider_skips_failing_provider_and_uses_next(self):
-        """Test that the factory skips providers that fail to construct."""
-        factory = SecretsAuthProviderFactory()
 
-        # Create mock providers - first one fails, second succeeds
-        mock_aws = MockProvider("aws")
+class TestProviderResolution:
+    """Test provider resolution and caching."""
 
-        mock_providers = {
-            "vault": FailingMockProvider,  # This will fail
-            "aws-secrets-manager": lambda: mock_aws,  # This will succeed
-            "azure-key-vault": lambda: MockProvider("azure"),
-        }
+    @pytest.mark.parametrize("mock_providers", ["vault_and_aws"], indirect=True)
+    def test_get_actual_provider_picks_first_enabled_and_caches_instance(
+        self, factory, mock_providers, vault_provider, monkeypatch,
+    ):
+        """Test that the factory picks the first enabled provider and caches the instance."""
+        def is_enabled_side_effect(name):
+            return name in ["vault", "aws-secrets-manager"]  # Both enabled
+
+        monkeypatch.setattr(mlflow_secrets_auth, "is_provider_enabled", is_enabled_side_effect)
+        monkeypatch.setattr(factory, "_PROVIDERS", mock_providers)
+
+        # First call should return vault (first in order)
+        provider1 = factory._get_actual_provider()
+        assert provider1 is vault_provider
+        assert provider1.name == "vault"
+
+        # Second call should return the same cached instance
+        provider2 = factory._get_actual_provider()
+        assert provider2 is provider1  # Same object, cached
+
+    @pytest.mark.parametrize("mock_providers", ["vault_and_aws"], indirect=True)
+    def test_get_actual_provider_skips_failing_provider_and_uses_next(
+        self, factory, mock_providers, aws_provider, monkeypatch,
+    ):
+        """Test that the factory skips providers that fail to construct."""
+        # First one fails, second succeeds
+        mock_providers["vault"] = FailingMockProvider
 
         def is_enabled_side_effect(name):
             return name in ["vault", "aws-secrets-manager"]  # Both enabled
 
-        with patch('mlflow_secrets_auth.is_provider_enabled', side_effect=is_enabled_side_effect), \
-             patch.object(factory, '_PROVIDERS', mock_providers):
+        monkeypatch.setattr(mlflow_secrets_auth, "is_provider_enabled", is_enabled_side_effect)
+        monkeypatch.setattr(factory, "_PROVIDERS", mock_providers)
 
-            # Should skip vault (fails) and return aws
-            provider = factory._get_actual_provider()
-            assert provider is mock_aws
-            assert provider.name == "aws"
+        # Should skip vault (fails) and return aws
+        provider = factory._get_actual_provider()
+        assert provider is aws_provider
+        assert provider.name == "aws"
 
-    def test_get_actual_provider_returns_none_when_no_providers_enabled(self):
+    def test_get_actual_provider_returns_none_when_no_providers_enabled(self, factory, monkeypatch):
         """Test that _get_actual_provider returns None when no providers are enabled."""
-        factory = SecretsAuthProviderFactory()
-
-        with patch('mlflow_secrets_auth.is_provider_enabled', return_value=False):
-            provider = factory._get_actual_provider()
-            assert provider is None
+        monkeypatch.setattr(mlflow_secrets_auth, "is_provider_enabled", lambda _name: False)
+        provider = factory._get_actual_provider()
+        assert provider is None
 
-    def test_get_actual_provider_returns_none_when_all_providers_fail(self):
+    def test_get_actual_provider_returns_none_when_all_providers_fail(self, factory, monkeypatch):
         """Test that _get_actual_provider returns None when all enabled providers fail."""
-        factory = SecretsAuthProviderFactory()
-
         mock_providers = {
             "vault": FailingMockProvider,
             "aws-secrets-manager": FailingMockProvider,
             "azure-key-vault": FailingMockProvider,
         }
 
-        with patch('mlflow_secrets_auth.is_provider_enabled', return_value=True), \
-             patch.object(factory, '_PROVIDERS', mock_providers):
+        monkeypatch.setattr(mlflow_secrets_auth, "is_provider_enabled", lambda _name: True)
+        monkeypatch.setattr(factory, "_PROVIDERS", mock_providers)
 
-            provider = factory._get_actual_provider()
-            assert provider is None
+        provider = factory._get_actual_provider()
+        assert provider is None
 
 
 class TestDelegationMethods:
     """Test delegation methods of the factory."""
 
-    def test_delegation_methods_return_provider_values(self):
+    @pytest.mark.parametrize(
+        ("method", "expected"),
+        [
+            ("_fetch_secret", "secret_from_vault"),
+            ("_get_cache_key", "cache_key_vault"),
+            ("_get_auth_mode", "basic"),
+            ("_get_ttl", 123),
+        ],
+    )
+    def test_delegates_to_provider(self, factory, vault_provider, monkeypatch, method, expected):
         """Test that factory methods delegate to the actual provider."""
-        factory = SecretsAuthProviderFactory()
-        mock_provider = MockProvider("test")
-
-        # Mock the provider resolution to return our test provider
-        with patch.object(factory, '_get_actual_provider', return_value=mock_provider):
-            # Test all delegation methods
-            assert factory._fetch_secret() == "secret_from_test"
-            assert factory._get_cache_key() == "cache_key_test"
-            assert factory._get_auth_mode() == "basic"
-            assert factory._get_ttl() == 123
-
-    def test_delegation_methods_return_defaults_when_no_provider(self):
+        monkeypatch.setattr(factory, "_get_actual_provider", lambda: vault_provider)
+
+        assert getattr(factory, method)() == expected
+
+    @pytest.mark.parametrize(
+        ("method", "expected"),
+        [
+            ("_fetch_secret", None),
+            ("_get_cache_key", ""),
+            ("_get_auth_mode", "bearer"),
+            ("_get_ttl", 300),
+        ],
+    )
+    def test_defaults_when_no_provider(self, factory, monkeypatch, method, expected):
         """Test that factory methods return defaults when no provider is available."""
-        factory = SecretsAuthProviderFactory()
-
-        # Mock the provider resolution to return None
-        with patch.object(factory, '_get_actual_provider', return_value=None):
-            # Test all delegation methods return defaults
-            assert factory._fetch_secret() is None
-            assert factory._get_cache_key() == ""
-            assert factory._get_auth_mode() == "bearer"
-            assert factory._get_ttl() == 300
+        monkeypatch.setattr(factory, "_get_actual_provider", lambda: None)
 
-    def test_fetch_secret_handles_provider_none(self):
-        """Test _fetch_secret when provider is None."""
-        factory = SecretsAuthProviderFactory()
-
-        with patch.object(factory, '_get_actual_provider', return_value=None):
-            result = factory._fetch_secret()
-            assert result is None
-
-    def test_get_cache_key_handles_provider_none(self):
-        """Test _get_cache_key when provider is None."""
-        factory = SecretsAuthProviderFactory()
-
-        with patch.object(factory, '_get_actual_provider', return_value=None):
-            result = factory._get_cache_key()
-            assert result == ""
-
-    def test_get_auth_mode_handles_provider_none(self):
-        """Test _get_auth_mode when provider is None."""
-        factory = SecretsAuthProviderFactory()
-
-        with patch.object(factory, '_get_actual_provider', return_value=None):
-            result = factory._get_auth_mode()
-            assert result == "bearer"
-
-    def test_get_ttl_handles_provider_none(self):
-        """Test _get_ttl when provider is None."""
-        factory = SecretsAuthProviderFactory()
-
-        with patch.object(factory, '_get_actual_provider', return_value=None):
-            result = factory._get_ttl()
-            assert result == 300
+        assert getattr(factory, method)() == expected
 
 
 class TestFactoryInitialization:
     """Test factory initialization."""
 
-    def test_factory_initialization(self):
+    def test_factory_initialization(self, readonly_factory):
         """Test that the factory initializes correctly."""
-        factory = SecretsAuthProviderFactory()
-
         # Check base class initialization
-        assert factory.provider_name == "mlflow_secrets_auth"
-        assert factory.default_ttl == 300
-        assert factory._actual_provider is None
+        assert readonly_factory.provider_name == "mlflow_secrets_auth"
+        assert readonly_factory.default_ttl == 300
+        assert readonly_factory._actual_provider is None
 
-    def test_factory_providers_mapping_exists(self):
+    def test_factory_providers_mapping_exists(self, readonly_factory):
         """Test that the _PROVIDERS mapping is correctly defined."""
-        factory = SecretsAuthProviderFactory()
-
         # Check that all expected providers are in the mapping
-        assert "vault" in factory._PROVIDERS
-        assert "aws-secrets-manager" in factory._PROVIDERS
-        assert "azure-key-vault" in factory._PROVIDERS
+        assert "vault" in readonly_factory._PROVIDERS
+        assert "aws-secrets-manager" in readonly_factory._PROVIDERS
+        assert "azure-key-vault" in readonly_factory._PROVIDERS
 
         # Check that the mapping contains classes
-        for provider_cls in factory._PROVIDERS.values():
+        for provider_cls in readonly_factory._PROVIDERS.values():
             assert callable(provider_cls)
 
 
 class TestIntegrationScenarios:
     """Test integration scenarios combining multiple aspects."""
 
-    def test_full_delegation_flow_with_successful_provider(self):
+    @pytest.mark.parametrize("mock_providers", ["vault_only"], indirect=True)
+    def test_full_delegation_flow_with_successful_provider(
+        self, factory, mock_providers, vault_provider, monkeypatch,
+    ):
         """Test the full flow from enablement check to method delegation."""
-        factory = SecretsAuthProviderFactory()
-        mock_provider = MockProvider("integration_test")
-
         def is_enabled_side_effect(name):
             return name == "vault"
 
-        mock_providers = {
-            "vault": lambda: mock_provider,
-            "aws-secrets-manager": lambda: MockProvider("aws"),
-            "azure-key-vault": lambda: MockProvider("azure"),
-        }
-
-        with patch('mlflow_secrets_auth.is_provider_enabled', side_effect=is_enabled_side_effect), \
-             patch.object(factory, '_PROVIDERS', mock_providers):
+        monkeypatch.setattr(mlflow_secrets_auth, "is_provider_enabled", is_enabled_side_effect)
+        monkeypatch.setattr(factory, "_PROVIDERS", mock_providers)
 
-            # Test enablement
-            assert factory._is_enabled() is True
+        # Test enablement
+        assert factory._is_enabled() is True
 
-            # Test provider resolution and caching
-            provider1 = factory._get_actual_provider()
-            provider2 = factory._get_actual_provider()
-            assert provider1 is provider2  # Cached
-            assert provider1 is mock_provider
+        # Test provider resolution and caching
+        provider1 = factory._get_actual_provider()
+        provider2 = factory._get_actual_provider()
+        assert provider1 is provider2  # Cached
+        assert provider1 is vault_provider
 
-            # Test delegation
-            assert factory._fetch_secret() == "secret_from_integration_test"
-            assert factory._get_cache_key() == "cache_key_integration_test"
-            assert factory._get_auth_mode() == "basic"
-            assert factory._get_ttl() == 123
+        # Test delegation
+        assert factory._fetch_secret() == "secret_from_vault"
+        assert factory._get_cache_key() == "cache_key_vault"
+        assert factory._get_auth_mode() == "basic"
+        assert factory._get_ttl() == 123
 
-    def test_full_delegation_flow_with_no_providers(self):
-        """Test the full flow when no providers are enabled."""
-        factory = SecretsAuthProviderFactory()
+    def test_config_resolved_once_across_requests(self, factory, monkeypatch):
+        """Test that the factory memoizes config against the actual provider's variables."""
+        monkeypatch.setenv("MLFLOW_SECRETS_AUTH_ENABLE", "vault")
+        monkeypatch.setattr(factory, "_PROVIDERS", {"vault": _CountingProvider})
 
-        with patch('mlflow_secrets_auth.is_provider_enabled', return_value=False):
-            # Test enablement
-            assert factory._is_enabled() is False
+        for _ in range(100):
+            assert factory.get_request_auth("https://mlflow.example.com") is not None
 
-            # Test provider resolution
-            provider = factory._get_actual_provider()
-            assert provider is None
+        provider = factory._get_actual_provider()
+        assert provider.calls == {"cache_key": 1, "auth_mode": 1, "ttl": 1}
 
-            # Test delegation defaults
-            assert factory._fetch_secret() is None
-            assert factory._get_cache_key() == ""
-            assert factory._get_auth_mode() == "bearer"
-            assert factory._get_ttl() == 300
+        # Changing one of the provider's variables re-resolves once
+        monkeypatch.setenv("MLFLOW_VAULT_TTL_SEC", "600")
+        factory.get_request_auth("https://mlflow.example.com")
+        assert provider.calls == {"cache_key": 2, "auth_mode": 2, "ttl": 2}
 
-    def test_provider_priority_order(self):
+    def test_full_delegation_flow_with_no_providers(self, factory, monkeypatch):
+        """Test the full flow when no providers are enabled."""
+        monkeypatch.setattr(mlflow_secrets_auth, "is_provider_enabled", lambda _name: False)
+
+        # Test enablement
+        assert factory._is_enabled() is False
+
+        # Test provider resolution
+        provider = factory._get_actual_provider()
+        assert provider is None
+
+        # Test delegation defaults
+        assert factory._fetch_secret() is None
+        assert factory._get_cache_key() == ""
+        assert factory._get_auth_mode() == "bearer"
+        assert factory._get_ttl() == 300
+
+    @pytest.mark.parametrize(
+        ("enabled", "expected_name"),
+        [
+            ({"aws-secrets-manager"}, "aws"),
+            ({"vault", "aws-secrets-manager"}, "vault"),
+            ({"vault", "aws-secrets-manager", "azure-key-vault"}, "vault"),
+        ],
+        ids=["aws-only", "vault-and-aws", "all"],
+    )
+    def test_provider_priority_order(self, factory, mock_providers, monkeypatch, enabled, expected_name):
         """Test that providers are chosen in the correct priority order."""
-        factory = SecretsAuthProviderFactory()
-
-        # Create distinguishable mock providers
-        vault_provider = MockProvider("vault_priority")
-        aws_provider = MockProvider("aws_priority")
-        azure_provider = MockProvider("azure_priority")
-
-        mock_providers = {
-            "vault": lambda: vault_provider,
-            "aws-secrets-manager": lambda: aws_provider,
-            "azure-key-vault": lambda: azure_provider,
-        }
-
-        # Test: only AWS enabled -> should get AWS
-        with patch('mlflow_secrets_auth.is_provider_enabled',
-                  side_effect=lambda name: name == "aws-secrets-manager"), \
-             patch.object(factory, '_PROVIDERS', mock_providers):
-
-            factory._actual_provider = None  # Reset cache
-            provider = factory._get_actual_provider()
-            assert provider is aws_provider
-
-        # Test: AWS and Vault enabled -> should get Vault (higher priority)
-        with patch('mlflow_secrets_auth.is_provider_enabled',
-                  side_effect=lambda name: name in ["vault", "aws-secrets-manager"]), \
-             patch.object(factory, '_PROVIDERS', mock_providers):
-
-            factory._actual_provider = None  # Reset cache
-            provider = factory._get_actual_provider()
-            assert provider is vault_provider
-
-        # Test: all enabled -> should get Vault (highest priority)
-        with patch('mlflow_secrets_auth.is_provider_enabled', return_value=True), \
-             patch.object(factory, '_PROVIDERS', mock_providers):
+        monkeypatch.setattr(factory, "_PROVIDERS", mock_providers)
+        monkeypatch.setattr(mlflow_secrets_auth, "is_provider_enabled", enabled.__contains__)
 
-            factory._actual_provider = None  # Reset cache
-            provider = factory._get_actual_provider()
-            assert provider is vault_provider
+        assert factory._get_actual_provider().name == expected_name
 
 
 class TestExceptionHandling:
     """Test exception handling in various scenarios."""
 
-    def test_no_exceptions_propagate_from_factory_methods(self):
-        """Test that no unexpected exceptions propagate from factory methods."""
-        factory = SecretsAuthProviderFactory()
-
-        # Test with a provider that might raise exceptions
-        problematic_provider = Mock()
-        problematic_provider._fetch_secret.side_effect = Exception("Fetch error")
-        problematic_provider._get_cache_key.side_effect = Exception("Cache error")
-        problematic_provider._get_auth_mode.side_effect = Exception("Auth error")
-        problematic_provider._get_ttl.side_effect = Exception("TTL error")
-
-        with patch.object(factory, '_get_actual_provider', return_value=problematic_provider):
-            # These should not raise exceptions but may return unexpected values
-            # The exact behavior depends on implementation details
-            try:
-                factory._fetch_secret()
-                factory._get_cache_key()
-                factory._get_auth_mode()
-                factory._get_ttl()
-            except Exception as e:
-                # If exceptions do propagate, they should be expected ones
-                assert "error" in str(e).lower()
-
-    def test_factory_handles_provider_resolution_gracefully(self):
-        """Test that factory handles provider resolution errors gracefully."""
-        factory = SecretsAuthProviderFactory()
-
-        # Mock is_provider_enabled to raise an exception
-        with patch('mlflow_secrets_auth.is_provider_enabled',
-                  side_effect=Exception("Config error")):
-
-            # _is_enabled should handle this gracefully
-            try:
-                result = factory._is_enabled()
-                # If no exception is raised, we accept any boolean result
-                assert isinstance(result, bool)
-            except Exception:
-                # If an exception is raised, it should be the expected one
-                pass
+    @pytest.mark.parametrize(
+        ("method", "message"),
+        [
+            ("_fetch_secret", "Fetch error"),
+            ("_get_cache_key", "Cache error"),
+            ("_get_auth_mode", "Auth error"),
+            ("_get_ttl", "TTL error"),
+        ],
+    )
+    def test_provider_exceptions_propagate_from_factory_methods(self, factory, monkeypatch, method, message):
+        """Test that delegated methods propagate provider errors unchanged."""
+        monkeypatch.setattr(factory, "_get_actual_provider", _ExplodingProvider)
+
+        with pytest.raises(RuntimeError, match=message):
+            getattr(factory, method)()
+
+    def test_provider_resolution_errors_propagate(self, readonly_factory, monkeypatch):
+        """Test that _is_enabled propagates errors raised by the enablement check."""
+        def failing_is_enabled(_name):
+            msg = "Config error"
+            raise RuntimeError(msg)
+
+        monkeypatch.setattr(mlflow_secrets_auth, "is_provider_enabled", failing_is_enabled)
+
+        with pytest.raises(RuntimeError, match="Config error"):
+            readonly_factory._is_enabled()
@@ -3,6 +3,7 @@
 
 import pytest
 
+from mlflow_secrets_auth import utils
 from mlflow_secrets_auth.utils import (
     retry_with_jitter,
     parse_secret_json,
@@ -12,6 +13,10 @@ from mlflow_secrets_auth.utils import (
 )
 
 
+def _no_sleep(_delay):
+    """Stand-in for time.sleep so retry tests never block."""
+
+
 class TestRetryWithJitter:
     """Test retry_with_jitter functionality."""
 
@@ -35,7 +40,7 @@ class TestRetryWithJitter:
                 raise Exception(msg)
             return f"success on attempt {call_count}"
 
-        result = retry_with_jitter(retry_then_success, attempts=3)
+        result = retry_with_jitter(retry_then_success, attempts=3, sleep=_no_sleep)
         assert result == "success on attempt 3"
         assert call_count == 3
 
@@ -46,10 +51,12 @@ class TestRetryWithJitter:
             raise ValueError(msg)
 
         with pytest.raises(ValueError, match="Always fails"):
-            retry_with_jitter(always_fail, attempts=2)
+            retry_with_jitter(always_fail, attempts=2, sleep=_no_sleep)
 
-    def test_retry_with_custom_parameters(self):
+    def test_retry_with_custom_parameters(self, monkeypatch):
         """Test retry with custom parameters."""
+        # random() == 0.75 puts the jitter at +50% of its range, i.e. +20% here
+        monkeypatch.setattr(utils.random, "random", lambda: 0.75)
         call_count = 0
         sleep_calls = []
 
@@ -78,12 +85,8 @@ class TestRetryWithJitter:
         assert call_count == 3
         assert len(sleep_calls) == 2  # Should sleep between attempts 1-2 and 2-3
 
-        # Verify that sleep delays are in reasonable ranges (with jitter)
-        # Base delay = 0.1, so with jitter, should be roughly 0.1 ± 0.04 (40%)
-        assert 0.06 <= sleep_calls[0] <= 0.14, f"First delay {sleep_calls[0]} out of expected range"
-
-        # Second delay = 0.2 (0.1 * 2^1), with jitter should be roughly 0.2 ± 0.08
-        assert 0.12 <= sleep_calls[1] <= 0.28, f"Second delay {sleep_calls[1]} out of expected range"
+        # Base delays 0.1 and 0.2 (0.1 * 2^1), each shifted by +20% jitter
+        assert sleep_calls == pytest.approx([0.12, 0.24])
 
     def test_retry_no_sleep_after_last_attempt(self):
         """Test that no sleep occurs after the final failed attempt."""
@@ -116,7 +119,7 @@ class TestRetryWithJitter:
         with pytest.raises(Exception):
             retry_with_jitter(
                 fail_many_times,
-                attempts=5,
+                attempts=3,
                 base_delay=1.0,
                 backoff=10.0,  # Large backoff
                 max_delay=2.0,  # Small max delay
@@ -124,9 +127,8 @@ class TestRetryWithJitter:
                 sleep=mock_sleep,
             )
 
-        # All delays should be capped at max_delay (2.0)
-        for delay in sleep_calls:
-            assert delay <= 2.0
+        # Uncapped delays would be 1.0 and 10.0; the second is clamped to max_delay
+        assert sleep_calls == [1.0, 2.0]
 
     def test_retry_zero_jitter(self):
         """Test retry with zero jitter for predictable delays."""
@@ -167,10 +169,10 @@ class TestRetryWithJitter:
             raise RuntimeError(msg)
 
         with pytest.raises(ValueError, match="Value error"):
-            retry_with_jitter(fail_with_value_error, attempts=2)
+            retry_with_jitter(fail_with_value_error, attempts=2, sleep=_no_sleep)
 
         with pytest.raises(RuntimeError, match="Runtime error"):
-            retry_with_jitter(fail_with_runtime_error, attempts=2)
+            retry_with_jitter(fail_with_runtime_error, attempts=2, sleep=_no_sleep)
 
 
 class TestParseSecretJson:
@@ -203,13 +205,11 @@ class TestParseSecretJson:
         result = parse_secret_json("not-json-token")
         assert result == {"token": "not-json-token"}
 
-    def test_parse_empty_secret(self):
+    @pytest.mark.parametrize("secret", ["", "   ", "\t\n"], ids=["empty", "spaces", "tab-newline"])
+    def test_parse_empty_secret(self, secret):
         """Test parsing empty secret raises ValueError."""
         with pytest.raises(ValueError, match="Secret is empty"):
-            parse_secret_json("")
-
-        with pytest.raises(ValueError, match="Secret is empty"):
-            parse_secret_json("   ")
+            parse_secret_json(secret)
 
     def test_parse_invalid_json_object(self):
         """Test parsing JSON object with invalid fields."""
@@ -226,78 +226,67 @@ class TestParseSecretJson:
 class TestFormatDuration:
     """Test format_duration functionality."""
 
-    def test_format_seconds(self):
-        """Test formatting seconds."""
-        assert format_duration(45) == "45s"
-        assert format_duration(1) == "1s"
-
-    def test_format_minutes(self):
-        """Test formatting minutes."""
-        assert format_duration(60) == "1m"
-        assert format_duration(125) == "2m 5s"
-        assert format_duration(120) == "2m"
-
-    def test_format_hours(self):
-        """Test formatting hours."""
-        assert format_duration(3600) == "1h"
-        assert format_duration(3660) == "1h 1m"
-        assert format_duration(7200) == "2h"
+    @pytest.mark.parametrize(
+        ("seconds", "expected"),
+        [
+            (45, "45s"),
+            (1, "1s"),
+            (60, "1m"),
+            (125, "2m 5s"),
+            (120, "2m"),
+            (3600, "1h"),
+            (3660, "1h 1m"),
+            (7200, "2h"),
+        ],
+    )
+    def test_format_duration(self, seconds, expected):
+        """Test formatting seconds, minutes and hours."""
+        assert format_duration(seconds) == expected
 
 
 class TestValidateTtl:
     """Test validate_ttl functionality."""
 
-    def test_validate_valid_ttl(self):
-        """Test validating valid TTL values."""
-        assert validate_ttl(300) == 300
-        assert validate_ttl(600) == 600
-
-    def test_validate_none_ttl(self):
-        """Test validating None TTL uses default."""
-        assert validate_ttl(None) == 300  # Default
-
-    def test_validate_zero_ttl(self):
-        """Test validating zero TTL uses default."""
-        assert validate_ttl(0) == 300  # Default
-
-    def test_validate_negative_ttl(self):
-        """Test validating negative TTL uses default."""
-        assert validate_ttl(-10) == 300  # Default
-
-    def test_validate_ttl_with_custom_default(self):
-        """Test validating TTL with custom default."""
-        assert validate_ttl(None, default=600) == 600
-        assert validate_ttl(0, default=600) == 600
-
-    def test_validate_ttl_clamping(self):
-        """Test TTL clamping to min/max values."""
-        # Float gets converted to int(0) -> default 300 is used
-        assert validate_ttl(0.5, min_ttl=1, default=300) == 300
-        assert validate_ttl(5000, max_ttl=3600) == 3600  # Clamped to max
-        # Test actual clamping with valid integers
-        assert validate_ttl(0, min_ttl=5, default=300) == 300  # 0 -> default -> clamped to min
-        assert validate_ttl(1, min_ttl=5) == 5  # Below min, clamped up
+    @pytest.mark.parametrize(
+        ("ttl", "kwargs", "expected"),
+        [
+            (300, {}, 300),
+            (600, {}, 600),
+            (None, {}, 300),  # Default
+            (0, {}, 300),  # Default
+            (-10, {}, 300),  # Default
+            (None, {"default": 600}, 600),
+            (0, {"default": 600}, 600),
+            # Float gets converted to int(0) -> default 300 is used
+            (0.5, {"min_ttl": 1, "default": 300}, 300),
+            (5000, {"max_ttl": 3600}, 3600),  # Clamped to max
+            (0, {"min_ttl": 5, "default": 300}, 300),  # 0 -> default -> clamped to min
+            (1, {"min_ttl": 5}, 5),  # Below min, clamped up
+        ],
+        ids=[
+            "valid-300", "valid-600", "none", "zero", "negative",
+            "none-custom-default", "zero-custom-default",
+            "float", "clamp-max", "zero-min", "clamp-min",
+        ],
+    )
+    def test_validate_ttl(self, ttl, kwargs, expected):
+        """Test defaulting and min/max clamping of TTL values."""
+        assert validate_ttl(ttl, **kwargs) == expected
 
 
 class TestMaskSecret:
     """Test mask_secret functionality."""
 
-    def test_mask_long_secret(self):
-        """Test masking long secret."""
-        result = mask_secret("abcdefghijklmnop", show_chars=4)
-        assert result == "abcd...mnop"
-
-    def test_mask_short_secret(self):
-        """Test masking short secret."""
-        result = mask_secret("abc")
-        assert result == "***"
-
-    def test_mask_empty_secret(self):
-        """Test masking empty secret."""
-        result = mask_secret("")
-        assert result == "***"
-
-    def test_mask_with_custom_show_chars(self):
-        """Test masking with custom show_chars."""
-        result = mask_secret("abcdefghijklmnop", show_chars=2)
-        assert result == "ab...op"
+    @pytest.mark.parametrize(
+        ("secret", "kwargs", "expected"),
+        [
+            ("abcdefghijklmnop", {"show_chars": 4}, "abcd...mnop"),
+            ("abc", {}, "***"),
+            ("", {}, "***"),
+            ("abcdefghijklmnop", {"show_chars": 2}, "ab...op"),
+        ],
+        ids=["long", "short", "empty", "custom-show-chars"],
+    )
+    def test_mask_secret(self, secret, kwargs, expected):
+        """Test masking long, short and empty secrets."""
+        assert mask_secret(secret, **kwargs) == expected
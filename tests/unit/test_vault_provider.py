@@ -1,57 +1,56 @@
 """Unit tests for Vault provider."""
 
-import os
+from types import MappingProxyType
 from unittest.mock import Mock, patch
 
+import pytest
+
 from mlflow_secrets_auth.providers.vault import VaultAuthProvider
 
+# KV v2 read response carrying a bearer token; the provider json.dumps the
+# innermost payload, so only the envelope is read-only
+_TOKEN_SECRET_RESPONSE = MappingProxyType({
+    'data': MappingProxyType({
+        'data': {
+            'token': 'test-secret-token',
+        },
+    }),
+})
+
+
+def _hvac_client(*, authenticated=True, **attrs):
+    """Build an hvac client mock in one configuration pass."""
+    return Mock(**{"is_authenticated.return_value": authenticated, **attrs})
+
 
+@pytest.fixture
+def vault_client():
+    """Yield a provider, the hvac client it will build, and the patched ``hvac.Client``."""
+    with patch('hvac.Client') as mock_hvac_client:
+        mock_client = mock_hvac_client.return_value = _hvac_client()
+        yield VaultAuthProvider(), mock_client, mock_hvac_client
+
+
+@pytest.mark.usefixtures("vault_env")
 class TestVaultProvider:
     """Test Vault provider."""
 
-    def setup_method(self):
-        """Setup test environment."""
-        # Clear any existing environment variables
-        for key in os.environ.copy():
-            if key.startswith(('MLFLOW_', 'VAULT_')):
-                del os.environ[key]
-
-        # Clear cache to ensure test isolation
-        from mlflow_secrets_auth.cache import clear_cache
-        clear_cache()
-
-        # Set required environment variables
-        os.environ["MLFLOW_SECRETS_AUTH_ENABLE"] = "vault"
-        os.environ["VAULT_ADDR"] = "https://vault.example.com"
-        os.environ["VAULT_TOKEN"] = "test-token"
-        os.environ["MLFLOW_VAULT_SECRET_PATH"] = "secret/data/test"
-
-    @patch('hvac.Client')
-    def test_provider_name(self, mock_hvac_client):
+    def test_provider_name(self, vault_client):
         """Test provider name."""
-        mock_client = Mock()
-        mock_hvac_client.return_value = mock_client
-        mock_client.is_authenticated.return_value = True
-
-        provider = VaultAuthProvider()
+        provider, _, _ = vault_client
         assert provider.get_name() == "vault"
 
-    @patch('hvac.Client')
-    def test_provider_disabled(self, mock_hvac_client):
+    def test_provider_disabled(self, vault_client, monkeypatch):
         """Test that disabled provider returns None."""
-        del os.environ["MLFLOW_SECRETS_AUTH_ENABLE"]
-
-        mock_client = Mock()
-        mock_hvac_client.return_value = mock_client
-        mock_client.is_authenticated.return_value = True
+        monkeypatch.delenv("MLFLOW_SECRETS_AUTH_ENABLE")
+        provider, _, _ = vault_client
 
-        provider = VaultAuthProvider()
         auth = provider.get_auth()
         assert auth is None
 
-    def test_missing_vault_addr(self):
+    def test_missing_vault_addr(self, monkeypatch):
         """Test behavior when Vault address is not configured."""
-        del os.environ["VAULT_ADDR"]
+        monkeypatch.delenv("VAULT_ADDR")
 
         provider = VaultAuthProvider()
 
@@ -59,34 +58,19 @@ class TestVaultProvider:
         auth = provider.get_auth()
         assert auth is None
 
-    @patch('hvac.Client')
-    def test_missing_secret_path(self, mock_hvac_client):
+    def test_missing_secret_path(self, vault_client, monkeypatch):
         """Test behavior when secret path is not configured."""
-        del os.environ["MLFLOW_VAULT_SECRET_PATH"]
-
-        provider = VaultAuthProvider()
+        monkeypatch.delenv("MLFLOW_VAULT_SECRET_PATH")
+        provider, _, _ = vault_client
 
         # Should return None instead of raising exception
         auth = provider.get_auth()
         assert auth is None
 
-    @patch('hvac.Client')
-    def test_token_auth(self, mock_hvac_client):
+    def test_token_auth(self, vault_client):
         """Test token-based authentication."""
-        mock_client = Mock()
-        mock_hvac_client.return_value = mock_client
-        mock_client.is_authenticated.return_value = True
-
-        # Mock the secret response
-        mock_client.secrets.kv.v2.read_secret_version.return_value = {
-            'data': {
-                'data': {
-                    'token': 'test-secret-token',
-                },
-            },
-        }
-
-        provider = VaultAuthProvider()
+        provider, mock_client, mock_hvac_client = vault_client
+        mock_client.secrets.kv.v2.read_secret_version.return_value = _TOKEN_SECRET_RESPONSE
 
         # Trigger client initialization by calling get_auth
         provider.get_auth()
@@ -96,34 +80,19 @@ class TestVaultProvider:
         # Verify token was set
         assert mock_client.token == 'test-token'
 
-    @patch('hvac.Client')
-    def test_approle_auth(self, mock_hvac_client):
+    def test_approle_auth(self, vault_client, monkeypatch):
         """Test AppRole-based authentication."""
         # Remove token and set AppRole credentials
-        del os.environ["VAULT_TOKEN"]
-        os.environ["VAULT_ROLE_ID"] = "test-role-id"
-        os.environ["VAULT_SECRET_ID"] = "test-secret-id"
-
-        mock_client = Mock()
-        mock_hvac_client.return_value = mock_client
-        mock_client.is_authenticated.return_value = True
-
-        # Mock AppRole login response
-        mock_client.auth.approle.login.return_value = {
-            'auth': {'client_token': 'test-approle-token'},
-        }
-
-        # Mock the secret response
-        mock_client.secrets.kv.v2.read_secret_version.return_value = {
-            'data': {
-                'data': {
-                    'token': 'test-secret-token',
-                },
-            },
-        }
+        monkeypatch.delenv("VAULT_TOKEN")
+        monkeypatch.setenv("VAULT_ROLE_ID", "test-role-id")
+        monkeypatch.setenv("VAULT_SECRET_ID", "test-secret-id")
 
-        provider = VaultAuthProvider()
-        provider._clear_client_cache()  # Clear any cached client
+        provider, mock_client, _ = vault_client
+        mock_client.configure_mock(**{
+            # AppRole login response
+            "auth.approle.login.return_value": {'auth': {'client_token': 'test-approle-token'}},
+            "secrets.kv.v2.read_secret_version.return_value": _TOKEN_SECRET_RESPONSE,
+        })
 
         # Trigger client initialization by calling get_auth
         provider.get_auth()
@@ -134,9 +103,9 @@ class TestVaultProvider:
             secret_id='test-secret-id',
         )
 
-    def test_missing_auth_credentials(self):
+    def test_missing_auth_credentials(self, monkeypatch):
         """Test behavior when no auth credentials are provided."""
-        del os.environ["VAULT_TOKEN"]
+        monkeypatch.delenv("VAULT_TOKEN")
 
         provider = VaultAuthProvider()
         provider._clear_client_cache()  # Clear any cached client
@@ -145,50 +114,25 @@ class TestVaultProvider:
         auth = provider.get_auth()
         assert auth is None
 
-    @patch('hvac.Client')
-    def test_authentication_failure(self, mock_hvac_client):
+    def test_authentication_failure(self, vault_client):
         """Test handling of authentication failure."""
-        mock_client = Mock()
-        mock_hvac_client.return_value = mock_client
+        provider, mock_client, _ = vault_client
         mock_client.is_authenticated.return_value = False
 
-        provider = VaultAuthProvider()
-        provider._clear_client_cache()  # Clear any cached client
-
         # Should return None instead of raising exception
         auth = provider.get_auth()
         assert auth is None
 
-    @patch('hvac.Client')
-    def test_custom_ttl(self, mock_hvac_client):
+    def test_custom_ttl(self, vault_client, monkeypatch):
         """Test custom TTL configuration."""
-        os.environ["MLFLOW_VAULT_TTL_SEC"] = "600"
+        monkeypatch.setenv("MLFLOW_VAULT_TTL_SEC", "600")
+        provider, _, _ = vault_client
 
-        mock_client = Mock()
-        mock_hvac_client.return_value = mock_client
-        mock_client.is_authenticated.return_value = True
-
-        provider = VaultAuthProvider()
         assert provider._get_ttl() == 600
 
-    @patch('hvac.Client')
-    def test_custom_auth_mode(self, mock_hvac_client):
+    def test_custom_auth_mode(self, vault_client, monkeypatch):
         """Test custom auth mode configuration."""
-        os.environ["MLFLOW_VAULT_AUTH_MODE"] = "basic"
-
-        mock_client = Mock()
-        mock_hvac_client.return_value = mock_client
-        mock_client.is_authenticated.return_value = True
+        monkeypatch.setenv("MLFLOW_VAULT_AUTH_MODE", "basic")
+        provider, _, _ = vault_client
 
-        provider = VaultAuthProvider()
         assert provider._get_auth_mode() == "basic"
-
-    def teardown_method(self):
-        """Clean up test environment."""
-        # Clear cache to ensure test isolation
-        from mlflow_secrets_auth.cache import clear_cache
-        clear_cache()
-
-        for key in os.environ.copy():
-            if key.startswith(('MLFLOW_', 'VAULT_')):
-                del os.environ[key]
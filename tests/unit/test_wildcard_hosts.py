@@ -1,154 +1,303 @@
 """Tests for wildcard host allowlist functionality."""
 
+import fnmatch
+from urllib.parse import urlparse
 
-from mlflow_secrets_auth.utils import is_host_allowed
+import pytest
+
+from mlflow_secrets_auth.utils import _compile_host_patterns, _extract_host, _host_matches, is_host_allowed
 
 
 class TestWildcardHostAllowlist:
     """Test wildcard patterns in host allowlisting."""
 
-    def test_none_allowlist_allows_all(self):
+    @pytest.mark.parametrize(
+        "url",
+        ["https://any.example.com/path", "http://malicious.com", "https://localhost:8080"],
+    )
+    def test_none_allowlist_allows_all(self, url):
         """Test that None allowlist allows all hosts."""
-        assert is_host_allowed("https://any.example.com/path", None) is True
-        assert is_host_allowed("http://malicious.com", None) is True
-        assert is_host_allowed("https://localhost:8080", None) is True
-
-    def test_exact_hostname_matching(self):
+        assert is_host_allowed(url, None) is True
+
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            # Exact matches should work
+            ("https://example.com/api", True),
+            ("http://api.prod.com:8080/health", True),
+            ("https://localhost/admin", True),
+            # Non-matches should be rejected
+            ("https://sub.example.com", False),
+            ("https://api.staging.com", False),
+            ("https://evil.com", False),
+        ],
+    )
+    def test_exact_hostname_matching(self, url, expected):
         """Test exact hostname matching (no wildcards)."""
-        allowed = ["example.com", "api.prod.com", "localhost"]
-
-        # Exact matches should work
-        assert is_host_allowed("https://example.com/api", allowed) is True
-        assert is_host_allowed("http://api.prod.com:8080/health", allowed) is True
-        assert is_host_allowed("https://localhost/admin", allowed) is True
-
-        # Non-matches should be rejected
-        assert is_host_allowed("https://sub.example.com", allowed) is False
-        assert is_host_allowed("https://api.staging.com", allowed) is False
-        assert is_host_allowed("https://evil.com", allowed) is False
-
-    def test_wildcard_subdomain_patterns(self):
+        assert is_host_allowed(url, ["example.com", "api.prod.com", "localhost"]) is expected
+
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            # Subdomain wildcards should match
+            ("https://api.example.com", True),
+            ("https://web.example.com/path", True),
+            ("https://very.long.subdomain.example.com", True),
+            # Middle wildcards should match
+            ("https://api.prod.com", True),
+            ("https://api.staging.com", True),
+            # Non-matches should be rejected
+            ("https://example.com", False),  # No subdomain
+            ("https://example.org", False),  # Wrong TLD
+            ("https://web.api.staging.com", False),  # Extra subdomain
+        ],
+    )
+    def test_wildcard_subdomain_patterns(self, url, expected):
         """Test wildcard patterns for subdomains."""
-        allowed = ["*.example.com", "api.*.com"]
-
-        # Subdomain wildcards should match
-        assert is_host_allowed("https://api.example.com", allowed) is True
-        assert is_host_allowed("https://web.example.com/path", allowed) is True
-        assert is_host_allowed("https://very.long.subdomain.example.com", allowed) is True
-
-        # Middle wildcards should match
-        assert is_host_allowed("https://api.prod.com", allowed) is True
-        assert is_host_allowed("https://api.staging.com", allowed) is True
-
-        # Non-matches should be rejected
-        assert is_host_allowed("https://example.com", allowed) is False  # No subdomain
-        assert is_host_allowed("https://example.org", allowed) is False  # Wrong TLD
-        assert is_host_allowed("https://web.api.staging.com", allowed) is False  # Extra subdomain
-
-    def test_wildcard_prefix_patterns(self):
+        assert is_host_allowed(url, ["*.example.com", "api.*.com"]) is expected
+
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            # Prefix wildcards should match
+            ("https://api-prod", True),
+            ("https://api-staging.local", True),
+            ("https://mlflow-prod.corp.com", True),
+            ("https://mlflow-staging.corp.com", True),
+            # Non-matches should be rejected
+            ("https://web-prod", False),
+            ("https://api", False),  # No suffix
+            ("https://mlflow.corp.com", False),  # Missing hyphen
+        ],
+    )
+    def test_wildcard_prefix_patterns(self, url, expected):
         """Test wildcard patterns for prefixes."""
-        allowed = ["api-*", "mlflow-*.corp.com"]
-
-        # Prefix wildcards should match
-        assert is_host_allowed("https://api-prod", allowed) is True
-        assert is_host_allowed("https://api-staging.local", allowed) is True
-        assert is_host_allowed("https://mlflow-prod.corp.com", allowed) is True
-        assert is_host_allowed("https://mlflow-staging.corp.com", allowed) is True
-
-        # Non-matches should be rejected
-        assert is_host_allowed("https://web-prod", allowed) is False
-        assert is_host_allowed("https://api", allowed) is False  # No suffix
-        assert is_host_allowed("https://mlflow.corp.com", allowed) is False  # Missing hyphen
-
-    def test_complex_wildcard_patterns(self):
+        assert is_host_allowed(url, ["api-*", "mlflow-*.corp.com"]) is expected
+
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            # Multi-level wildcards
+            ("https://api.v1.example.com", True),
+            ("https://web.staging.example.com", True),
+            # Complex middle patterns
+            ("https://mlflow-eu-prod.com", True),
+            ("https://mlflow-us-west-prod.com", True),
+            # Non-matches
+            ("https://api.example.com", False),  # Not enough levels
+            ("https://mlflow-staging.com", False),  # Wrong suffix
+        ],
+    )
+    def test_complex_wildcard_patterns(self, url, expected):
         """Test more complex wildcard patterns."""
-        allowed = ["*.*.example.com", "mlflow-*-prod.com"]
-
-        # Multi-level wildcards
-        assert is_host_allowed("https://api.v1.example.com", allowed) is True
-        assert is_host_allowed("https://web.staging.example.com", allowed) is True
-
-        # Complex middle patterns
-        assert is_host_allowed("https://mlflow-eu-prod.com", allowed) is True
-        assert is_host_allowed("https://mlflow-us-west-prod.com", allowed) is True
-
-        # Non-matches
-        assert is_host_allowed("https://api.example.com", allowed) is False  # Not enough levels
-        assert is_host_allowed("https://mlflow-staging.com", allowed) is False  # Wrong suffix
-
-    def test_mixed_exact_and_wildcard_patterns(self):
+        assert is_host_allowed(url, ["*.*.example.com", "mlflow-*-prod.com"]) is expected
+
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            # Exact matches
+            ("https://localhost:8080", True),
+            ("https://api.prod.example.com", True),
+            # Wildcard matches
+            ("https://web.staging.com", True),
+            ("https://mlflow-dev", True),
+            ("https://mlflow-production.local", True),
+            # Non-matches
+            ("https://api.staging.example.com", False),
+            ("https://web.prod.com", False),
+        ],
+    )
+    def test_mixed_exact_and_wildcard_patterns(self, url, expected):
         """Test mixing exact matches with wildcard patterns."""
         allowed = ["localhost", "*.staging.com", "api.prod.example.com", "mlflow-*"]
-
-        # Exact matches
-        assert is_host_allowed("https://localhost:8080", allowed) is True
-        assert is_host_allowed("https://api.prod.example.com", allowed) is True
-
-        # Wildcard matches
-        assert is_host_allowed("https://web.staging.com", allowed) is True
-        assert is_host_allowed("https://mlflow-dev", allowed) is True
-        assert is_host_allowed("https://mlflow-production.local", allowed) is True
-
-        # Non-matches
-        assert is_host_allowed("https://api.staging.example.com", allowed) is False
-        assert is_host_allowed("https://web.prod.com", allowed) is False
-
-    def test_case_sensitivity(self):
+        assert is_host_allowed(url, allowed) is expected
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://api.example.com",
+            "https://API.EXAMPLE.COM",
+            "https://Web.Example.Com",
+            "https://api.prod.com",
+            "https://API.PROD.COM",
+        ],
+    )
+    def test_case_sensitivity(self, url):
         """Test that hostname matching is case-insensitive (as per DNS standards)."""
-        allowed = ["*.Example.COM", "API.prod.com"]
-
-        # Different cases should all match
-        assert is_host_allowed("https://api.example.com", allowed) is True
-        assert is_host_allowed("https://API.EXAMPLE.COM", allowed) is True
-        assert is_host_allowed("https://Web.Example.Com", allowed) is True
-        assert is_host_allowed("https://api.prod.com", allowed) is True
-        assert is_host_allowed("https://API.PROD.COM", allowed) is True
-
-    def test_empty_hostname_handling(self):
-        """Test handling of URLs with missing or invalid hostnames."""
-        allowed = ["*.example.com"]
-
-        # Invalid URLs should be rejected
-        assert is_host_allowed("not-a-url", allowed) is False
-        assert is_host_allowed("", allowed) is False
-        assert is_host_allowed("file:///local/path", allowed) is False
-
-    def test_port_handling(self):
+        assert is_host_allowed(url, ["*.Example.COM", "API.prod.com"]) is True
+
+    @pytest.mark.parametrize("url", ["not-a-url", "", "file:///local/path"])
+    def test_empty_hostname_handling(self, url):
+        """Test that URLs with missing or invalid hostnames are rejected."""
+        assert is_host_allowed(url, ["*.example.com"]) is False
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://api.example.com:8080",
+            "https://web.example.com:443",
+            "https://localhost:3000",
+            "https://localhost:8000/path",
+        ],
+    )
+    def test_port_handling(self, url):
         """Test that ports are ignored in hostname matching."""
-        allowed = ["*.example.com", "localhost"]
+        assert is_host_allowed(url, ["*.example.com", "localhost"]) is True
+
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            ("https://api1.example.com", True),
+            ("https://apia.example.com", True),
+            ("https://host1", True),
+            ("https://hosta", True),
+            # Should not match multiple characters
+            ("https://api12.example.com", False),
+            ("https://host12", False),
+        ],
+    )
+    def test_single_character_wildcards(self, url, expected):
+        """Test single character wildcards using '?'."""
+        assert is_host_allowed(url, ["api?.example.com", "host?"]) is expected
+
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            # Character ranges and classes
+            ("https://api1.example.com", True),
+            ("https://api9.example.com", True),
+            ("https://hosta", True),
+            ("https://hostb", True),
+            ("https://hostc", True),
+            # Should not match outside the class
+            ("https://apia.example.com", False),
+            ("https://hostd", False),
+            ("https://host1", False),
+        ],
+    )
+    def test_bracket_patterns(self, url, expected):
+        """Test character class patterns using brackets."""
+        assert is_host_allowed(url, ["api[0-9].example.com", "host[abc]"]) is expected
 
-        # Ports should be stripped from hostname comparison
-        assert is_host_allowed("https://api.example.com:8080", allowed) is True
-        assert is_host_allowed("https://web.example.com:443", allowed) is True
-        assert is_host_allowed("https://localhost:3000", allowed) is True
-        assert is_host_allowed("https://localhost:8000/path", allowed) is True
+    def test_allowlist_compiled_once(self):
+        """Test that repeated lookups reuse the compiled allowlist."""
+        allowed = ["compiled-once.example.com", "*.compiled-once.dev"]
+        _compile_host_patterns.cache_clear()
+        _host_matches.cache_clear()
 
-    def test_single_character_wildcards(self):
-        """Test single character wildcards using '?'."""
-        allowed = ["api?.example.com", "host?"]
+        assert is_host_allowed("https://compiled-once.example.com", allowed) is True
+        assert is_host_allowed("https://api.compiled-once.dev", allowed) is True
+        assert is_host_allowed("https://other.example.com", allowed) is False
 
-        # Single character wildcards
-        assert is_host_allowed("https://api1.example.com", allowed) is True
-        assert is_host_allowed("https://apia.example.com", allowed) is True
-        assert is_host_allowed("https://host1", allowed) is True
-        assert is_host_allowed("https://hosta", allowed) is True
+        info = _compile_host_patterns.cache_info()
+        assert info.misses == 1
+        assert info.hits == 2
 
-        # Should not match multiple characters
-        assert is_host_allowed("https://api12.example.com", allowed) is False
-        assert is_host_allowed("https://host12", allowed) is False
+    def test_repeated_host_checks_are_memoized(self):
+        """Test that re-checking a host against the same allowlist hits the result cache."""
+        allowed = ["*.memo.example.com"]
+        _host_matches.cache_clear()
 
-    def test_bracket_patterns(self):
-        """Test character class patterns using brackets."""
-        allowed = ["api[0-9].example.com", "host[abc]"]
-
-        # Character ranges and classes
-        assert is_host_allowed("https://api1.example.com", allowed) is True
-        assert is_host_allowed("https://api9.example.com", allowed) is True
-        assert is_host_allowed("https://hosta", allowed) is True
-        assert is_host_allowed("https://hostb", allowed) is True
-        assert is_host_allowed("https://hostc", allowed) is True
-
-        # Should not match outside the class
-        assert is_host_allowed("https://apia.example.com", allowed) is False
-        assert is_host_allowed("https://hostd", allowed) is False
-        assert is_host_allowed("https://host1", allowed) is False
+        assert is_host_allowed("https://api.memo.example.com/a", allowed) is True
+        assert is_host_allowed("https://API.memo.example.com:443/b", allowed) is True
+        assert is_host_allowed("https://evil.com", allowed) is False
+
+        info = _host_matches.cache_info()
+        assert info.misses == 2
+        assert info.hits == 1
+
+    def test_empty_allowlist_rejects_all(self):
+        """Test that an empty (but configured) allowlist matches nothing."""
+        assert is_host_allowed("https://example.com", []) is False
+
+    def test_allowlist_split_into_exact_suffix_and_wildcard_parts(self):
+        """Test that exact entries and *.domain suffixes skip the regex."""
+        allowlist = _compile_host_patterns(
+            ("MLflow.Example.com", "*.Corp.example.com", "API-*", "api-?", "mlflow.*.com"),
+        )
+
+        assert allowlist.exact == frozenset({"mlflow.example.com"})
+        assert allowlist.suffixes == frozenset({"corp.example.com"})
+        assert allowlist.prefixes == ("api-",)
+        assert allowlist.wildcard.match("api-1")
+        assert allowlist.wildcard.match("mlflow.prod.com")
+        assert not allowlist.wildcard.match("web.corp.example.com")
+        assert allowlist.wildcard_min_len == len("api-?")
+
+        allowlist = _compile_host_patterns(("localhost",))
+        assert allowlist.exact == frozenset({"localhost"})
+        assert allowlist.suffixes == frozenset()
+        assert allowlist.prefixes == ()
+        assert allowlist.wildcard is None
+
+    def test_short_hosts_rejected_before_regex(self):
+        """Test that hosts shorter than every wildcard pattern never reach the regex."""
+        allowlist = _compile_host_patterns(("mlflow-*.corp.com", "host?.internal[0-9]"))
+        assert allowlist.wildcard_min_len == len("host?.internal")
+
+        assert is_host_allowed("https://mlflow-a.corp.com", ["mlflow-*.corp.com"]) is True
+        assert is_host_allowed("https://mlflow-.corp.com", ["mlflow-*.corp.com"]) is True
+        assert is_host_allowed("https://a.corp.com", ["mlflow-*.corp.com"]) is False
+        assert is_host_allowed("https://host1.internal7", ["host?.internal[0-9]"]) is True
+
+    @pytest.mark.parametrize(
+        "host",
+        ["a.corp.example.com", "a.b.corp.example.com", ".corp.example.com", "corp.example.com", "xcorp.example.com"],
+    )
+    def test_suffix_patterns_agree_with_fnmatch(self, host):
+        """Test that *.domain suffix lookups give the same verdict as fnmatch."""
+        assert is_host_allowed(f"https://{host}/", ["*.corp.example.com"]) is fnmatch.fnmatch(host, "*.corp.example.com")
+
+    @pytest.mark.parametrize("host", ["mlflow-", "mlflow-a", "mlflow-a.b.c", "mlflow", "xmlflow-a", "a.mlflow-b"])
+    def test_prefix_patterns_agree_with_fnmatch(self, host):
+        """Test that prefix* lookups give the same verdict as fnmatch."""
+        assert is_host_allowed(f"https://{host}/", ["mlflow-*"]) is fnmatch.fnmatch(host, "mlflow-*")
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://API.example.com:8080/path",
+        "http://user:pw@host.example.com:80/p?q=1#frag",
+        "http://[::1]:8080/",
+        "https://host.example.com?x=1",
+        "https://host.example.com#frag",
+        "https://",
+        "not-a-url",
+        "",
+        "file:///local/path",
+        "http://[::1",
+        "http://[fe80::1%25eth0]:8080/",
+        "http://user[x@host.example.com/",
+        "a?x=http://allowed.example.com",
+        "1http://allowed.example.com",
+        " https://allowed.example.com",
+        "https://allowed.example.com ",
+        "https://allowed.exa\tmple.com/",
+        "https://allowed.example.com\\@evil.com/",
+        "https://ALLOWED.\u00e9xample.com/",
+    ],
+)
+def test_extract_host_matches_urlparse(url):
+    """Test that the fast host extraction agrees with urlparse, denying what it rejects."""
+    try:
+        expected = urlparse(url).hostname
+    except ValueError:
+        expected = None
+    assert _extract_host(url) == expected
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "http://[evil]good/",
+        "http://[allowed.example.com]/",
+        "http://[127.0.0.1]/",
+        "http://user@[allowed.example.com]:80/",
+        "a?x=http://allowed.example.com",
+    ],
+)
+def test_malformed_urls_denied(url):
+    """Test that bracketed non-IPv6 hosts and URLs without an authority are denied."""
+    assert _extract_host(url) is None
+    assert is_host_allowed(url, ["evil", "allowed.example.com", "127.0.0.1", "*.example.com"]) is False